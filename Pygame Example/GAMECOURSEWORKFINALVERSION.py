@@ -20,23 +20,31 @@ sys.path.append("/export/mailgrp3_e/um10kh/py3./lib/python3.3/site-packages")
 #import relevant modules
 import pygame
 from pygame import *
-#easypg is used for colours module and Sprite classes
-import easypg
+#easypg is used for the colours module
 from easypg import colours
-#time is used for time.sleep function
-import time
 #gameclasses includes player, enemy and camera classes
 import gameclasses
-#ground blocks includes platform and background classes
-import groundblocks
-#specialblocks include jump pads, hearts, coins and fallblocks
-import specialblocks
+#assets loads each image once and keeps it ready to draw
+import assets
+#renderer works out which parts of the screen need sending to the window
+import renderer
+#hud draws the lives, score and time, only rendering text when it changes
+import hud
+#ui keeps the menu screens once they are built and only redraws what changes
+import ui
+#scenes has a class for each screen of the game and runs whichever is current
+import scenes
+#scheduler runs things after a delay without stopping the game
+import scheduler
 #pygbutton is a python file downloaded from http://www.pygame.org/project-PygButton-2709-.html
 #this is used for easy to place button for the user interface
 import pygbutton
-#the ps3 file takes a controller and creates a dictionary to recognise it
-#as a ps3 controller
-import ps3trial
+#controls turns key presses and controller buttons into game actions
+import controls
+#world builds the levels and runs the player and enemies in them
+import world
+#replay records what the player pressed each tick so a game can be played back
+import replay
 
 ##import levelrandomgenerator
 
@@ -49,6 +57,9 @@ HALF_HEIGHT = int(SCREEN_HEIGHT / 2)
 SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
 FLAGS = 0
 DEPTH = 32
+#only send the parts of the screen that changed to the window each frame,
+#set to False to always update the whole screen
+DIRTY_RECTS = True
 
 class Game():
     #define level number variables, lives and level scores outside the
@@ -57,40 +68,45 @@ class Game():
     levelscore = 0
     lives = 3  
 
-    #main menu variables defined outside __init__ so when game restarts, the
-    #main menu doesn't open
-    mainmenu = True
-
     def __init__(self):
         """Running the __init__ function will reset all the game variables
         and restart the current level"""
-        #create bg surface to be drawn to screen
-        self.bg = pygame.Surface(SIZE).convert()
-        
         #initialise joystick
         self.joysticks = []
         for i in range(0, pygame.joystick.get_count()):
             self.joysticks.append(pygame.joystick.Joystick(i))
             self.joysticks[-1].init()
-        
-        #create groups and sprites, allsprites is ordered to determine what
-        #appears on top of what in game
-        self.playergroup = pygame.sprite.Group()
-        self.allsprites = pygame.sprite.OrderedUpdates()
-
-        #create empty lists for level building
-        self.enemies = []
-        self.collectibles = []
-        self.fallblocks = []
-        self.jumppads = []
-        self.platforms = []
-        self.exitdoor = []
-        self.heartlist = []
-
-        #set pygame font for in-game text
-        self.font = pygame.font.SysFont("debussy.tff", 30)
-        self.mediumfont = pygame.font.SysFont("debussy.tff", 50)
-        self.largefont = pygame.font.SysFont("debussy.tff", 70)
+
+        #fonts, sounds and menu screens never change, so only load them the
+        #first time rather than on every restart
+        if not hasattr(self, 'font'):
+            #set pygame font for in-game text
+            self.font = pygame.font.SysFont("debussy.tff", 30)
+            self.mediumfont = pygame.font.SysFont("debussy.tff", 50)
+            self.largefont = pygame.font.SysFont("debussy.tff", 70)
+
+            #set up sound effects for in game events
+            self.boing = pygame.mixer.Sound('gamesounds\\boing.ogg')
+            self.ding = pygame.mixer.Sound('gamesounds\\ding.ogg')
+            self.deathsound = pygame.mixer.Sound('gamesounds\\enemydeath.ogg')
+            self.fallsound = pygame.mixer.Sound("gamesounds\\falling.ogg")
+            #the sound for each event the world gives back
+            self.sounds = {'fall': self.fallsound, 'jumppad': self.boing, \
+                           'coin': self.ding, 'heart': self.ding, \
+                           'enemykilled': self.deathsound}
+
+            #the player, enemies and everything they touch, which run the
+            #same with or without a window
+            self.world = world.World()
+
+            #menu screens are built the first time they are shown
+            self.uiscreens = {}
+
+            #delays inside the game, e.g. respawning, are counted in whole
+            #ticks simulated rather than real seconds, so they happen on the
+            #same tick every time a replay is played back. Adding up 1/30ths
+            #of a second instead would drift and sometimes be a tick late
+            self.timers = scheduler.Scheduler()
 
         #define extra colours to be used for main menus
         self.BROWN = (72,39,21)
@@ -101,319 +117,123 @@ class Game():
         self.score = 0
         self.timer = 50
 
-        #ALL FOLLOWING LOOP VARIABLES ARE SET UP TO CONTROL GAME LOGIC
+        #ALL FOLLOWING VARIABLES ARE SET BY THE GAME LOGIC, THE PLAYING SCENE
+        #IN scenes.py CHECKS THEM TO KNOW WHICH SCREEN TO GO TO NEXT
         #set up level win conditions
         self.levelcomplete = False
-        self.levelcompleteloop = False
         self.gamecomplete = False
 
         #set up game over variables
         self.gameover = False
-        self.gameoverloop = False
 
         #set up game paused variables
         self.gamepaused = False
-        self.gamepause_loop = False
 
         #set up enter name for high score screen
-        self.enternamescreen = False
-        self.enternameloop = False
+        self.initials = []
         self.initialsname = ""
-        self.listcomplete = False
-
-        #set up screen for highscore addition
-        self.gamecompscore = False
 
-        #set up instructions screen loop variables
-        self.instructions = False
-
-        #set up sound effects for in game events
-        self.boing = pygame.mixer.Sound('gamesounds\\boing.ogg')
-        self.ding = pygame.mixer.Sound('gamesounds\\ding.ogg')
-        self.deathsound = pygame.mixer.Sound('gamesounds\\enemydeath.ogg')
-        self.fallsound = pygame.mixer.Sound("gamesounds\\falling.ogg")
-        
-        #create level/platforms
-        self.x = self.y = 0
-
-        if self.levelnumber == 1:
-            self.level = [
-                "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP",
-                "P1                                                                   P",
-                "P                                                                    P",
-                "P                                                                    P",
-                "P                                                                    P",
-                "P                                                                    P",
-                "P                                                                    P",
-                "P                                                              X     P",
-                "P               PP                                                   P",
-                "P       CE           C                                      PPPPPPP  P",
-                "P      PPPPPP        PP                        C  EC  C              P",
-                "P                                            PPPPPPPPPPP             P",
-                "P                          PP                                        P",
-                "P                                      PPP                           P",
-                "P                               PPPP                                 P",
-                "P                               P  P                                 P",
-                "P                      PJPPPPP  P  P                                 P",
-                "P                  PP           P  P                                 P",
-                "P           E                   P  P   C              C              P",
-                "PPPPPPPPPPPPPPPPP               P   JPPPPPPPPPPPPPPPPPPPPJPPPP       P",
-                "P               P               P                            P       P",
-                "P               P               P                            P       P",
-                "P               P               P                            P       P",
-                "                 FFFFFFFFFFFFFFF           FFFFFFF            FFFFFFFP",]
-        if self.levelnumber == 2:
-            self.level = [
-                "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP",
-                "P2                                                                     P",
-                "P                                                                      P",
-                "P                                                                      P",
-                "P                                                                      P",
-                "P                                            C    C                    P",
-                "P                                      C               C               P",
-                "P                                      E       E       E               P",
-                "P                                 PPPPPPPPPPPPPPPPPPPPPPPPPPPP         P",
-                "P                             C                                        P",
-                "P                            PP                                  E     P",
-                "P                                 CC                            PPPPP  P",
-                "P                                 PP                                   P",
-                "P                       C                CH                 P C        P",
-                "P                      PPJ                                   PPP       P",
-                "P                                    C        C                        P",
-                "P                 PPP                    E           E           E     P",
-                "P                       C            C        C                 PPPPP  P",
-                "P                      PPP                                             P",
-                "P                                    C        C             P C        P",
-                "P                 PPP                J        J              PPP       P",
-                "P                                                                      P",
-                "PPPPPPPPPPPPPPPPPPP                                               X    P",
-                "Pgggggggggggggggggg                                                    P",
-                "Pgggggggggggggggggg                                            PPPPPPPPP",
-                "Pgggggggggggggggggg                                            P       P",
-                "                   FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFP",]
-        if self.levelnumber == 3:
-            self.level = [
-                "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP",
-                "P3                                                                                                                           P",
-                "P                                                                                                                            P",
-                "P                                                                                                                            P",
-                "P                                                                                                                            P",
-                "P                                                                                                                            P",
-                "P                                                                                       PPPPPPPPPPP                          P",
-                "P                                                                                     PP           PPP                       P",
-                "P                                                                                   PP                PP                     P",
-                "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP    C               PPPPPPPPPPPPPPPPPPPPPP",
-                "P                                                                                    C                                       P",
-                "P                                                                                        E   C  E  C                         P",
-                "P                          C                                                          PPPPPPPPPPPPPPPP      C                P",
-                "P                     C                      P C                      CC           C                    PPP      C           P",
-                "P                          P     C  E  C    PP    C                C      C                                   PP      X      P",
-                "P      C              P                    P P   PP              PPPP    PPPP                                                P",
-                "PPPPPPPPPPPP    PPP          PPPPPPPPPPPPPP P       PPPPPPPPPP                 PPPJ                             PPPPPPPPPPPPPP",
-                "P          P    PPP          P             P        P        P                 PPPP                             P            P",
-                "P          P                 P            P         P        P                                                  P            P",
-                "P          P                 P           P          P        P                                                  P            P",
-                "P          P                 P           P          P        PH                                                 P            P",
-                "P           FFFFFFFFFFFFFFFFF             FFFFFFFFFF          JFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF             P",]
-            
-        
-        #build the level, looping over columns and rows, if 'letter' appears then
-        #append to the specified list and add to sprite list for drawing to the
-        #screen later. Then move on one character, until you hit the end
-        #of a row, then move onto the next row. This is done by adding 32 to
-        #the x and y variables within the loops
-
-        for row in self.level:
-            for col in row:
-                ###ALL THE SPRITES USED IN THE LEVEL BUILDING ARE FOUND IN
-                ###gameclasses.py, specialblocks.py and groundblocks.py
-                
-                #depending on the level, create the background in the top left
-                #corner, add them first to be drawn below everything else
-                if col == "1":
-                    p = groundblocks.BACK1(self.x, self.y)
-                    self.allsprites.add(p)
-                if col == "2":
-                    p = groundblocks.BACK2(self.x, self.y)
-                    self.allsprites.add(p)
-                if col == "3":
-                    p = groundblocks.BACK3(self.x, self.y)
-                    self.allsprites.add(p)
-
-                
-                #create platforms - will detect player collision on all sides
-                #Since the background contains the platform art, these square
-                #platforms will not be drawn in allsprites.
-                if col == "P":
-                    p = groundblocks.Platform(self.x, self.y)
-                    self.platforms.append(p)
-                #create blocks that detect when the player hits the top of them
-                #these are placed at the bottom of levels to detect when a player
-                #has fallen
-                if col == "F":
-                    p = specialblocks.Fallblock(self.x, self.y)
-                    self.fallblocks.append(p)
-                #create coins that detect a player collision for them to be
-                #collected. These are added to allsprites to be drawn to the
-                #screen
-                if col == "C":
-                    p = specialblocks.Collectible(self.x+4, self.y+4)
-                    self.collectibles.append(p)
-                    self.allsprites.add(p)
-                #heart has similar aspects to the collectible sprite but when
-                #collected gives an extra life instead of extra score
-                if col == "H":
-                    p = specialblocks.Heart(self.x+4, self.y+4)
-                    self.heartlist.append(p)
-                    self.allsprites.add(p)                    
-                #jumppad acts as a spring for the player to reach higher places
-                #This acts when a player collision is detected with the top of
-                #this object
-                if col == "J":
-                    p = specialblocks.Jumppad(self.x, self.y)
-                    self.jumppads.append(p)
-                #Exit door detects player collision and then activates level
-                #complete variables
-                if col == "X":
-                    p = specialblocks.Exit_door(self.x, self.y)
-                    self.exitdoor.append(p)
-                    self.allsprites.add(p)
-                #Enemies are moving sprites that will only die if the bottom of
-                #the player collides with the top of the enemy
-                if col == "E":
-                    p = gameclasses.Enemyblock(self.x, self.y-13)
-                    self.enemies.append(p)
-                    
-                self.x += 32
-            self.y += 32
-            self.x = 0
-        #add enemies to allsprites at the end to make them appear above
-        #items such as collectibles
-        for e in self.enemies:
-            self.allsprites.add(e)
+        #start the level, the world builds it the first time it is played
+        #and after that only puts the coins, hearts, enemies and player back
+        #where they started
+        self.world.reset(self.levelnumber)
+        level = self.world.level
+        self.staticlayer = level.staticlayer
+        self.drawgrid = level.drawgrid
+        #the world's sprites are ordered to determine what appears on top of
+        #what in game
+        self.allsprites = self.world.sprites
             
         #create total level width and height variables
-        self.level_width = len(self.level[0])*32
-        self.level_height = len(self.level)*32
+        self.level_width = level.width
+        self.level_height = level.height
 
         #add camera class (found in gameclasses)
         self.camera = gameclasses.Camera(gameclasses.camera_rect, \
                                          self.level_width, self.level_height)
 
-        #create player sprite- place at a different position depending on the
+        #the player sprite, placed at a different position depending on the
         #level number
-        if self.levelnumber == 1:
-            self.player = gameclasses.PLAYER(100,550)
-        if self.levelnumber == 2:
-            self.player = gameclasses.PLAYER(100,580)
-        if self.levelnumber == 3:
-            self.player = gameclasses.PLAYER(112, 470)
-        self.playergroup.add(self.player)
-        self.allsprites.add(self.player)
+        self.player = self.world.player
             
         #create player direction variables for movement
         self.up = self.down = self.left = self.right = False
-        
-        #set up pygame clock for FPS
-        self.clock = pygame.time.Clock()
+        #where things were before the last simulate step, used by draw
+        self.previous = {}
+        #set while waiting to restart the level after dying
+        self.dying = False
+
+        #keeps track of the parts of the screen that change each frame
+        self.renderer = renderer.DirtyRenderer(DIRTY_RECTS)
+        #in game text for lives, score and time left
+        self.hud = hud.HUD(self.font, colours.BLACK)
         
     def game_logic(self):
         """Running game logic checks for events in game such as player input,
         level win/game over conditions etc"""
-        #set FPS for self.clock
-        self.clock.tick(30)
-
         #using variables activated when an event occurs to the player, check
         #for player death and restart level with one less life
-        if self.player.falldeath == True:
-            time.sleep(1)
-            self.lives -= 1
-            self.__init__()
-        if self.player.playerdeath == True:
-            time.sleep(1)
-            self.lives -= 1
-            self.__init__()
+        if (self.player.falldeath == True or self.player.playerdeath == True) \
+           and not self.dying:
+            self.die()
         #if all lives are over, set game over variables equal to true
         if self.lives == -1:
             self.gameover = True
-            self.gameoverloop = True
 
-        #check level complete conditions, return False to stop running
-        if self.player.levelcomplete == True and self.levelnumber < 3:
+        #check level complete conditions, return False to stop running. A
+        #player who died on the same tick is respawning, not finishing
+        if self.player.levelcomplete == True and self.levelnumber < 3 \
+           and not self.dying:
             self.levelcomplete = True
-            self.levelcompleteloop = True
 
         #if third level complete send player to game complete screen    
-        if self.player.levelcomplete == True and self.levelnumber == 3:
+        if self.player.levelcomplete == True and self.levelnumber == 3 \
+           and not self.dying:
             self.gamecomplete = True            
 
                 
-        #check events in game, return False to quit game loop, other basic keys
-        #used for movement
-        for e in pygame.event.get():
-            if e.type == QUIT or \
-               (e.type == KEYDOWN and e.key == K_ESCAPE) or \
-                e.type == JOYBUTTONDOWN and e.dict == {'button': 0, 'joy': 0}:
-                return False           
-
-            #p button and start button used to start pause game variables
-            if e.type == KEYDOWN and e.key == K_p or \
-               e.type == JOYBUTTONDOWN and e.dict == {'button': 3, 'joy': 0}:
-                self.gamepaused = True
-                self.gamepause_loop = True
-
-            #up button sets up to true for jumping
-            if (e.type == KEYDOWN and e.key == K_UP) or \
-                (e.type == KEYDOWN and e.key == K_SPACE) or \
-                e.type == JOYBUTTONDOWN and e.dict == {'button': 14, 'joy': 0}:
-                    self.up = True
-            if (e.type == KEYUP and e.key == K_UP) or \
-                (e.type == KEYUP and e.key == K_SPACE) or \
-                e.type == JOYBUTTONUP and e.dict == {'button': 14, 'joy': 0}:
-                self.up = False
-
-            #right button sets right to true
-            if (e.type == KEYDOWN and e.key == K_LEFT) or\
-               e.type == JOYBUTTONDOWN and e.dict == {'button': 7, 'joy': 0}:
-                self.left = True
-            if e.type == KEYUP and e.key == K_LEFT or\
-               e.type == JOYBUTTONUP and e.dict == {'button': 7, 'joy': 0}:
-                self.left = False
-
-            #left button sets left tot true  
-            if e.type == KEYDOWN and e.key == K_RIGHT or\
-               e.type == JOYBUTTONDOWN and e.dict == {'button': 5, 'joy': 0}:
-                self.right = True
-            if e.type == KEYUP and e.key == K_RIGHT or\
-               e.type == JOYBUTTONUP and e.dict == {'button': 5, 'joy': 0}:
-                self.right = False
-                    
+        #check the controls, return False to quit game loop, pause, or the
+        #basic directions used for movement
+        if controls.actions.was_pressed(controls.QUIT):
+            return False
+        if controls.actions.was_pressed(controls.PAUSE):
+            self.gamepaused = True
+        self.up = controls.actions.is_held(controls.JUMP)
+        self.left = controls.actions.is_held(controls.LEFT)
+        self.right = controls.actions.is_held(controls.RIGHT)
         return True
 
-    def display_update(self, screen):
-        """Updates things to do with the display in game such as updating sprites
-        scores, time, extra live variables etc"""
+    def simulate(self):
+        """Moves the game on by one frame, updating sprites, scores, time, extra
+        live variables etc"""
+        self.timers.advance(1)
+        #while waiting to respawn everything stays where it is
+        if self.dying:
+            self.previous = {}
+            return
         #if the game is not over and the level is not complete
         if not self.gameover:
-            #clear all sprites first
-            self.allsprites.clear(screen, self.bg)
+            #remember where the camera, player and enemies were before this
+            #step, draw puts them in between there and where they end up
+            self.previous = {self.camera: self.camera.state.topleft, \
+                             self.player: self.player.rect.topleft}
+            for e in self.world.awake:
+                self.previous[e] = e.rect.topleft
             #call camera update in relation to player position
             self.camera.update(self.player)
-            #update player with all variables (sounds, other items, movement etc)
-            self.player.update(self.up, self.down, self.left, self.right, \
-                               self.platforms, self.fallblocks, self.fallsound, \
-                               self.jumppads, self.boing, self.collectibles, \
-                               self.ding, self.enemies, self.deathsound, \
-                               self.exitdoor, self.allsprites\
-                               ,self.heartlist)
-            #check state and animate player using gameclasses.py
-            self.player.check_state()
-            self.player.animate()
-            #update all enemies movement
-            for e in self.enemies:
-                e.update()
-                e.check_state()
-                e.animate()
+            #move the player and enemies on a tick in the world, then play
+            #the sound for anything that happened
+            actions = 0
+            if self.up:
+                actions |= controls.JUMP
+            if self.left:
+                actions |= controls.LEFT
+            if self.right:
+                actions |= controls.RIGHT
+            observation, events = self.world.step(actions)
+            for event in events:
+                if event in self.sounds:
+                    self.sounds[event].play()
             #update score depending on the enemies killed etc
             self.score = (self.player.enemieskilled *50) + \
                          (self.player.collected*10)
@@ -431,43 +251,125 @@ class Game():
                 self.score = self.score + (3*int("{:.0f}".format(self.timer)))
             if not self.levelcomplete:
                 self.score += self.levelscore
-            self.timer -= 1/30
+            self.timer -= 1/gameclasses.TICK_RATE
             #check if timer reaches zero, set gameover equal to true
             if self.timer <= 0:
                 self.timer = 0
-                time.sleep(1)
-                self.lives -= 1
-                self.__init__()
-            #draw everything to screen in regards to what is in the camera rectangle
-            for e in self.allsprites:
-                screen.blit(e.image, self.camera.apply(e))
+                self.die()
+
+    def die(self):
+        """Stops the level for a second, then restarts it with one less life.
+        The game keeps running while it waits, it just doesn't move"""
+        self.dying = True
+        self.timers.after(gameclasses.TICK_RATE, self.respawn)
+
+    def respawn(self):
+        self.lives -= 1
+        self.__init__()
+
+    def next_level(self):
+        """Starts the level after this one, keeping lives and score"""
+        #nothing waiting from the last level, e.g. a respawn, carries over
+        self.timers.clear()
+        #the built level is kept, but its art is big and only needed again
+        #if it is played again
+        self.world.level.release_art()
+        self.levelnumber += 1
+        self.__init__()
+
+    def restart_game(self):
+        """Goes back to level 1 with 3 lives and no score"""
+        self.timers.clear()
+        if self.levelnumber != 1:
+            self.world.level.release_art()
+        self.lives = 3
+        self.levelnumber = 1
+        self.score = 0
+        self.levelscore = 0
+        self.__init__()
+
+    def between(self, thing, position, alpha):
+        """Returns the point alpha of the way from where thing was before the
+        last simulate to position, where it is now"""
+        x, y = self.previous.get(thing, position)
+        return (int(round(x + (position[0] - x) * alpha)), \
+                int(round(y + (position[1] - y) * alpha)))
+
+    def draw(self, screen, alpha=1):
+        """Draws the level, sprites and in game text where the camera is.
+        Frames can be drawn more often than the game is simulated, so alpha
+        says how far the frame is between the last two simulate steps and
+        the camera, player and enemies are drawn that far between where they
+        were and where they are now"""
+        if not self.gameover:
+            #draw everything to screen in regards to what is in the camera
+            #rectangle. The backgrounds and doors are all in the static layer
+            #so take a blit or two. The coins and hearts are looked up in the
+            #level's draw grid so only the ones on screen are checked, ones
+            #that have been collected are no longer in allsprites so are
+            #skipped. Each blit is passed to the renderer so it knows which
+            #parts of the screen changed, if the camera moved it updates all
+            #of it, which covers the static layer
+            offset = self.between(self.camera, self.camera.state.topleft, \
+                                  alpha)
+            view = pygame.rect.Rect(-offset[0], -offset[1], \
+                                    SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.renderer.begin(view.topleft)
+            self.staticlayer.draw(screen, view)
+            for e in self.drawgrid.query(view):
+                if self.allsprites.has(e):
+                    self.renderer.track(e, screen.blit(e.image, \
+                                                       e.rect.move(offset)))
+            #then the enemies and player on top, in the same order as before.
+            #Only enemies awake near the camera can be on screen
+            for e in self.world.awake:
+                rect = e.image.get_rect(topleft=self.between(e, \
+                                        e.rect.topleft, alpha))
+                if view.colliderect(rect):
+                    self.renderer.track(e, screen.blit(e.image, \
+                                        rect.move(offset)), True)
+            rect = self.player.image.get_rect(topleft=self.between( \
+                   self.player, self.player.rect.topleft, alpha))
+            self.renderer.track(self.player, screen.blit(self.player.image, \
+                                rect.move(offset)), True)
             #draw UI information to screen - score, health, items collected,
             #time left etc, format time for no decimal places, format score to fit
-            #nicely on screen then blit all to screen
-            healthtext = self.font.render("Lives : {0}".format(self.lives), \
-                                          True, colours.BLACK)
-            scoretext = self.font.render("Score: {0}".format(self.score), \
-                                         True, colours.BLACK)
-            timetext = self.font.render("Time left : {:.0f}".format(self.timer)\
-                                        , True, colours.BLACK)
-            screen.blit(healthtext, [30, 30])
-            screen.blit(scoretext, [30, 80])
-            screen.blit(timetext, [SCREEN_WIDTH-160, 30])
-        pygame.display.update()
-
-
-
-
-    def menuscreen(self, screen):
-        """A function to draw the main menu screen with event loop"""
-        #load menu bg, text and graphics
-        menubg = pygame.image.load("menuscreen.bmp")
-        bgrect = menubg.get_rect()
-        screen.blit(menubg, bgrect)
-        pygame.draw.rect(screen, self.CREAM, [215,125,375,415], 0)
-        pygame.draw.rect(screen, self.BROWN, [215,125,375,415], 5)
+            #nicely on screen then blit all to screen. The hud only renders
+            #the text again when it is different to last frame
+            self.hud.draw(screen, self.renderer, 'lives', \
+                          "Lives : {0}".format(self.lives), [30, 30])
+            self.hud.draw(screen, self.renderer, 'score', \
+                          "Score: {0}".format(self.score), [30, 80])
+            self.hud.draw(screen, self.renderer, 'time', \
+                          "Time left : {:.0f}".format(self.timer), \
+                          [SCREEN_WIDTH-160, 30])
+        self.renderer.present()
+
+
+
+
+    def uiscreen(self, name):
+        """Returns one of the menu screens, building it the first time it is
+        needed and keeping it after that. The button captions depend on
+        whether a controller is plugged in, so each screen is kept for both"""
+        builders = {'menu': self.build_menuscreen,
+                    'instructions': self.build_instruction_screen,
+                    'gameover': self.build_game_over_screen,
+                    'entername': self.build_entername_screen}
+        key = (name, self.joysticks != [])
+        if key not in self.uiscreens:
+            self.uiscreens[key] = builders[name]()
+        return self.uiscreens[key]
+
+    def build_menuscreen(self):
+        """Builds the main menu bg, text and buttons"""
+        menu = ui.UIScreen(assets.images.load("menuscreen.bmp"))
+        menu.add_rect(self.CREAM, [215,125,375,415], 0)
+        menu.add_rect(self.BROWN, [215,125,375,415], 5)
         mainmenutext = self.largefont.render("JUNGLE RUN"\
                                         , True, self.BROWN)
+        menu.add_text(mainmenutext, [SCREEN_WIDTH // 2 -\
+                (mainmenutext.get_width() // 2) , 150])
         #if self.joysticks statement detects if a joystick exists or not
         if self.joysticks == []:
             #different text for button prompts depending on controller
@@ -495,51 +397,38 @@ class Game():
             exitbutton = pygbutton.PygButton((\
             (SCREEN_WIDTH // 2 - 30), (SCREEN_HEIGHT // 2 + 150), \
             80, 40), 'EXIT (O)')
-        
-        allButtons = (playbutton, instructbutton, exitbutton)
-
-        while True:
-            #in the main menu events, detect clicks in menu buttons and set certain
-            #screen variables to true to change the current game screen
-            for event in pygame.event.get():
-                if event.type == QUIT or \
-                   (event.type == KEYDOWN and event.key == K_ESCAPE) or\
-                    (event.type == JOYBUTTONDOWN and event.dict == {'joy': 0, 'button': 0}) or\
-                    (event.type == JOYBUTTONDOWN and event.dict == {'joy': 0, 'button': 13}) or\
-                    'click' in exitbutton.handleEvent(event):
-                    return False       
-
-                if 'click' in playbutton.handleEvent(event) or \
-                   (event.type == KEYDOWN and event.key == K_SPACE) or\
-                    (event.type == JOYBUTTONDOWN and event.dict == {'joy': 0, 'button': 14}):
-                    self.ding.play()
-                    self.mainmenu = False
-                    self.mainmenuloop = False
-                    return True
-
-                if 'click' in instructbutton.handleEvent(event) or \
-                    (event.type == JOYBUTTONDOWN and event.dict == {'joy': 0, 'button': 15}):                   
-                    self.instruction_loop = True
-                    self.instructions = True
-                    return True
-
-            #blit text and buttons to the screen        
-            screen.blit(mainmenutext, [SCREEN_WIDTH // 2 -\
-                (mainmenutext.get_width() // 2) , 150])
-            for b in allButtons:
-                b.draw(screen)
-            
-            pygame.display.update()
-
+        menu.add_button('play', playbutton)
+        menu.add_button('instructions', instructbutton)
+        menu.add_button('exit', exitbutton)
+        return menu
 
-    def instruction_screen(self, screen):
-        """A function to draw the instructions screen with event loop"""
-        #create bg, text and graphics
-        menubg = pygame.image.load("menuscreen.bmp")
-        bgrect = menubg.get_rect()
-        screen.blit(menubg, bgrect)
-        pygame.draw.rect(screen, self.CREAM, [65,65,670,515], 0)
-        pygame.draw.rect(screen, self.BROWN, [65,65,670,515], 5)
+    def menuscreen(self, screen):
+        """A function to draw the main menu screen"""
+        #the menu is only built once, showing it draws all of it
+        self.uiscreen('menu').show(screen)
+
+    def menu_logic(self, events):
+        """Detects clicks in the menu buttons and returns the name of the
+        scene to change to, or None to stay on the menu"""
+        clicked = self.uiscreen('menu').handle_all(events)
+        if controls.actions.was_pressed(controls.QUIT | controls.BACK) or \
+           'exit' in clicked:
+            return 'quit'
+
+        if 'play' in clicked or controls.actions.was_pressed(controls.SELECT):
+            self.ding.play()
+            return 'playing'
+
+        if 'instructions' in clicked or \
+           controls.actions.was_pressed(controls.INSTRUCTIONS):
+            return 'instructions'
+        return None
+
+    def build_instruction_screen(self):
+        """Builds the instructions bg, text and back button"""
+        instructions = ui.UIScreen(assets.images.load("menuscreen.bmp"))
+        instructions.add_rect(self.CREAM, [65,65,670,515], 0)
+        instructions.add_rect(self.BROWN, [65,65,670,515], 5)
 
         #initialise buttons
         if self.joysticks == []:
@@ -550,7 +439,7 @@ class Game():
             backbutton = pygbutton.PygButton((\
             (SCREEN_WIDTH // 2 - 85), (SCREEN_HEIGHT // 2 + 185), \
             170, 40), 'BACK TO MENU (O)')
-        allButtons = (backbutton)
+        instructions.add_button('back', backbutton)
 
         #set up text lines for instructions screen
         keyboard = self.font.render("Keyboard",True,self.BROWN)
@@ -567,39 +456,35 @@ class Game():
         starttext = self.font.render("START BUTTON = Pause", True, self.BROWN)
         selecttext = self.font.render("SELECT = Quit", True, self.BROWN)
 
-        #blit all text to screen
-        screen.blit(keyboard, [100, 110])
-        screen.blit(spacetext, [100, 200])
-        screen.blit(lefttext, [100, 250])           
-        screen.blit(righttext, [100, 300])
-        screen.blit(ptext, [100, 350])
-        screen.blit(esctext, [100, 400])
-        
-        screen.blit(controllertext, [450, 110])
-        screen.blit(Xtext, [450, 200])
-        screen.blit(leftbtext, [450, 250])           
-        screen.blit(rightbtext, [450, 300])
-        screen.blit(starttext, [450, 350])
-        screen.blit(selecttext, [450, 400])
+        #add all text to the screen
+        instructions.add_text(keyboard, [100, 110])
+        instructions.add_text(spacetext, [100, 200])
+        instructions.add_text(lefttext, [100, 250])           
+        instructions.add_text(righttext, [100, 300])
+        instructions.add_text(ptext, [100, 350])
+        instructions.add_text(esctext, [100, 400])
         
-        while True: # instructions loop
-            #detects either quit or button press
-            for event in pygame.event.get():
-                if event.type == QUIT or \
-                   (event.type == KEYDOWN and event.key == K_ESCAPE) or\
-                    (event.type == JOYBUTTONDOWN and event.dict == {'joy': 0, 'button': 0}):
-                    return False       
-
-                if 'click' in backbutton.handleEvent(event) or \
-                    (event.type == JOYBUTTONDOWN and event.dict == {'joy': 0, 'button': 13}):
-                    self.instructions = False
-                    return True
-                else:
-                    True
-            #blit button in update loop so changes graphics on click
-            backbutton.draw(screen)
-                
-            pygame.display.update()
+        instructions.add_text(controllertext, [450, 110])
+        instructions.add_text(Xtext, [450, 200])
+        instructions.add_text(leftbtext, [450, 250])           
+        instructions.add_text(rightbtext, [450, 300])
+        instructions.add_text(starttext, [450, 350])
+        instructions.add_text(selecttext, [450, 400])
+        return instructions
+
+    def instruction_screen(self, screen):
+        """A function to draw the instructions screen"""
+        self.uiscreen('instructions').show(screen)
+
+    def instruction_logic(self, events):
+        """Detects either quit or back button press"""
+        clicked = self.uiscreen('instructions').handle_all(events)
+        if controls.actions.was_pressed(controls.QUIT):
+            return 'quit'
+
+        if 'back' in clicked or controls.actions.was_pressed(controls.BACK):
+            return 'menu'
+        return None
 
     def gamepause_screen(self, screen):
         """Draw the pause function to the screen"""
@@ -610,19 +495,16 @@ class Game():
         #blit to screen
         screen.blit(pause_text, [x, y-150])
         pygame.display.update()
+        #the pause text needs clearing off the whole screen when unpaused
+        self.renderer.invalidate()
 
     def gamepause_logic(self):
         """Detect unpause or quit after game is paused"""
-        keys = pygame.key.get_pressed()
-        #pause loop detects quit or unpause
-        for e in pygame.event.get():
-            if e.type == QUIT:
-                return False
-            if keys[pygame.K_ESCAPE]:
-                return False
-            if e.type == KEYDOWN and e.key == K_p or \
-            (e.type == JOYBUTTONDOWN and e.dict == {'button': 3, 'joy': 0}):
-                return True
+        if controls.actions.was_pressed(controls.QUIT):
+            return 'quit'
+        if controls.actions.was_pressed(controls.PAUSE):
+            return 'playing'
+        return None
 
 
 
@@ -653,32 +535,24 @@ class Game():
         
     def level_complete_logic(self):
         """Detect whether player wants to quit or go to next level"""
-        keys = pygame.key.get_pressed()
-        for e in pygame.event.get():
-            if e.type == QUIT or keys[pygame.K_ESCAPE] or\
-                (e.type == JOYBUTTONDOWN and e.dict == {'button': 13, 'joy': 0}):
-                return False
-            #if go to next level, add 1 to self.levelnumber and reset all other
-            #variables by doing self.__init__()
-            if keys[pygame.K_SPACE] or \
-                (e.type == JOYBUTTONDOWN and e.dict == {'button': 14, 'joy': 0}):
-                self.levelnumber += 1
-                self.__init__()
-        return True
+        if controls.actions.was_pressed(controls.QUIT | controls.BACK):
+            return 'quit'
+        #if go to next level, add 1 to self.levelnumber and reset all other
+        #variables by doing self.__init__()
+        if controls.actions.was_pressed(controls.SELECT):
+            self.next_level()
+            return 'playing'
+        return None
 
 
 
         
-    def game_over_screen(self, screen):
-        """if the game is over by the player falling/being killed by enemy,
-        print option of quitting, restarting the level or going back to main
-        menu"""
-        #set up text and graphics variables
-        menubg = pygame.image.load("menuscreen.bmp")
-        bgrect = menubg.get_rect()
-        screen.blit(menubg, bgrect)
-        pygame.draw.rect(screen, (255,206,173), [215,70,375,525], 0)
-        pygame.draw.rect(screen, (72,39,21), [215,70,375,525], 5)
+    def build_game_over_screen(self):
+        """Builds the game over bg and text, none of it changes so it is all
+        part of the screen's background"""
+        gameover = ui.UIScreen(assets.images.load("menuscreen.bmp"))
+        gameover.add_rect((255,206,173), [215,70,375,525], 0)
+        gameover.add_rect((72,39,21), [215,70,375,525], 5)
         gameover_text = self.largefont.render("GAME OVER", True, colours.BLACK)
         lives_text = self.font.render("You ran out of lives!", True, colours.BLACK)
         #set up text depending on controller existence
@@ -692,35 +566,32 @@ class Game():
             esc_text = self.font.render("press O to quit", True, colours.BLACK)    
         x = (SCREEN_WIDTH // 2) - (gameover_text.get_width() // 2)
         y = (SCREEN_HEIGHT // 2) - (gameover_text.get_height() // 2)
-        #blit everything to screen
-        screen.blit(gameover_text, [x, y-200])
-        screen.blit(lives_text, [(SCREEN_WIDTH // 2) - \
+        gameover.add_text(gameover_text, [x, y-200])
+        gameover.add_text(lives_text, [(SCREEN_WIDTH // 2) - \
                                  (lives_text.get_width() // 2), y-50])        
-        screen.blit(restart_text, [(SCREEN_WIDTH // 2) - \
+        gameover.add_text(restart_text, [(SCREEN_WIDTH // 2) - \
                                  (restart_text.get_width() // 2), (y+175)])
-        screen.blit(esc_text, [(SCREEN_WIDTH // 2) - \
+        gameover.add_text(esc_text, [(SCREEN_WIDTH // 2) - \
                                (esc_text.get_width() // 2), (y+250)])
-        pygame.display.update()
+        return gameover
+        
+    def game_over_screen(self, screen):
+        """if the game is over by the player falling/being killed by enemy,
+        print option of quitting, restarting the level or going back to main
+        menu"""
+        self.uiscreen('gameover').show(screen)
 
     def game_over_logic(self):
         """Detects if player wants to quit or restart whole game"""
-        keys = pygame.key.get_pressed()
-        for e in pygame.event.get():
-            if e.type == QUIT or keys[pygame.K_ESCAPE] or \
-                (e.type == JOYBUTTONDOWN and e.dict == {'button': 13, 'joy': 0})or\
-                (e.type == JOYBUTTONDOWN and e.dict == {'button': 0, 'joy': 0}):               
-                return False
-
-            if keys[pygame.K_r] or \
-               (e.type == JOYBUTTONDOWN and e.dict == {'joy': 0, 'button': 15}):
-                #if restart game then reset all level variables including score
-                #so player starts at level 1 with no score
-                self.lives = 3
-                self.levelnumber = 1
-                self.score = 0
-                self.levelscore = 0
-                self.__init__()
-        return True
+        if controls.actions.was_pressed(controls.QUIT | controls.BACK):
+            return 'quit'
+
+        if controls.actions.was_pressed(controls.RESTART):
+            #if restart game then reset all level variables including score
+            #so player starts at level 1 with no score
+            self.restart_game()
+            return 'playing'
+        return None
 
 
 
@@ -729,7 +600,7 @@ class Game():
         """If player completes level 3, go to level complete screen, which has
         high score details, whether a player wants to quit or restart whole game"""
         #create graphics and text variables
-        menubg = pygame.image.load("menuscreen.bmp")
+        menubg = assets.images.load("menuscreen.bmp")
         bgrect = menubg.get_rect()
         screen.blit(menubg, bgrect)
         pygame.draw.rect(screen, self.CREAM, [160,95,485,455], 0)
@@ -827,243 +698,82 @@ class Game():
     def gamecomplete_logic(self):
         """Game complete screen logic - detects whether player wants to enter name
         if they have a high score, fully restart game if not or quit game"""
-        keys = pygame.key.get_pressed()
-        for e in pygame.event.get():
-            if e.type == QUIT or keys[pygame.K_ESCAPE] or \
-                (e.type == JOYBUTTONDOWN and e.dict == {'button': 13, 'joy': 0}):               
-                return False
-            #if space or x pressed, go to enter name screen for high score
-            if keys[pygame.K_SPACE] or\
-                (e.type == JOYBUTTONDOWN and e.dict == {'button': 14, 'joy': 0}):
-                self.enternamescreen = True
-            if keys[pygame.K_r] or \
-               (e.type == JOYBUTTONDOWN and e.dict == {'joy': 0, 'button': 15}):
-                self.lives = 3
-                self.levelnumber = 1
-                self.score = 0
-                self.levelscore = 0
-                self.__init__()
-        return True
-
-    def entername_screen(self,screen):
-        """Screen with a keyboard of buttons for player to enter name with"""
-        #setup graphics and screen text
-        menubg = pygame.image.load("menuscreen.bmp")
-        bgrect = menubg.get_rect()
-        screen.blit(menubg, bgrect)
-        pygame.draw.rect(screen, self.CREAM, [215,125,375,365], 0)
-        pygame.draw.rect(screen, self.BROWN, [215,125,375,365], 5)
+        if controls.actions.was_pressed(controls.QUIT | controls.BACK):
+            return 'quit'
+        #if space or x pressed, go to enter name screen for high score
+        if controls.actions.was_pressed(controls.SELECT):
+            return 'entername'
+        if controls.actions.was_pressed(controls.RESTART):
+            self.restart_game()
+            return 'playing'
+        return None
+
+    def build_entername_screen(self):
+        """Builds the enter name bg, text, letter buttons and the label the
+        initials are shown in"""
+        entername = ui.UIScreen(assets.images.load("menuscreen.bmp"))
+        entername.add_rect(self.CREAM, [215,125,375,365], 0)
+        entername.add_rect(self.BROWN, [215,125,375,365], 5)
         mainmenutext = self.mediumfont.render("ENTER INITIALS"\
                                         , True, self.BROWN)
-        #set up button for each letter of the alphabet
-        abutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 155), (SCREEN_HEIGHT // 2 - 50), \
-        30, 40), 'A')
-        bbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 115), (SCREEN_HEIGHT // 2 - 50), \
-        30, 40), 'B')
-        cbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 75), (SCREEN_HEIGHT // 2 - 50),\
-        30, 40), 'C')
-        dbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 35), (SCREEN_HEIGHT // 2 - 50),\
-        30, 40), 'D')
-        ebutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 5), (SCREEN_HEIGHT // 2 - 50), \
-        30, 40), 'E')
-        fbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 45), (SCREEN_HEIGHT // 2 - 50), \
-        30, 40), 'F')
-        gbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 85), (SCREEN_HEIGHT // 2 - 50), \
-        30, 40), 'G')
-        hbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 125), (SCREEN_HEIGHT // 2 - 50), \
-        30, 40), 'H')
-        ibutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 155), (SCREEN_HEIGHT // 2), \
-        30, 40), 'I')
-        jbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 115), (SCREEN_HEIGHT // 2), \
-        30, 40), 'J')
-        kbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 75), (SCREEN_HEIGHT // 2), \
-        30, 40), 'K')
-        lbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 35), (SCREEN_HEIGHT // 2), \
-        30, 40), 'L')
-        mbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 5), (SCREEN_HEIGHT // 2), \
-        30, 40), 'M')
-        nbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 45), (SCREEN_HEIGHT // 2), \
-        30, 40), 'N')
-        obutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 85), (SCREEN_HEIGHT // 2), \
-        30, 40), 'O')
-        pbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 125), (SCREEN_HEIGHT // 2), \
-        30, 40), 'P')
-        qbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 155), (SCREEN_HEIGHT // 2 + 50), \
-        30, 40), 'Q')
-        rbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 115), (SCREEN_HEIGHT // 2 + 50), \
-        30, 40), 'R')
-        sbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 75), (SCREEN_HEIGHT // 2 + 50),\
-        30, 40), 'S')
-        tbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 35), (SCREEN_HEIGHT // 2 + 50),\
-        30, 40), 'T')
-        ubutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 5), (SCREEN_HEIGHT // 2 + 50), \
-        30, 40), 'U')
-        vbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 45), (SCREEN_HEIGHT // 2 + 50), \
-        30, 40), 'V')
-        wbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 85), (SCREEN_HEIGHT // 2 + 50), \
-        30, 40), 'W')
-        xbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 + 125), (SCREEN_HEIGHT // 2 + 50), \
-        30, 40), 'X')
-        ybutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 155), (SCREEN_HEIGHT // 2 + 100), \
-        30, 40), 'Y')
-        zbutton = pygbutton.PygButton((\
-        (SCREEN_WIDTH // 2 - 115), (SCREEN_HEIGHT // 2 + 100), \
-        30, 40), 'Z')
-        #create delete and enter button for nice UI
-        deletebutton = pygbutton.PygButton((\
+        entername.add_text(mainmenutext, [SCREEN_WIDTH // 2 -\
+                    (mainmenutext.get_width() // 2) , 150])
+        #set up button for each letter of the alphabet, eight to a row
+        for i, letter in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ"):
+            entername.add_button(letter, pygbutton.PygButton((\
+            (SCREEN_WIDTH // 2 - 155 + (i % 8) * 40), \
+            (SCREEN_HEIGHT // 2 - 50 + (i // 8) * 50), 30, 40), letter))
+        entername.add_button('delete', pygbutton.PygButton((\
         (SCREEN_WIDTH // 2 - 75), (SCREEN_HEIGHT // 2 + 100), \
-        110, 40), 'DELETE')
-        enterbutton = pygbutton.PygButton((\
+        110, 40), 'DELETE'))
+        entername.add_button('enter', pygbutton.PygButton((\
         (SCREEN_WIDTH // 2 + 45), (SCREEN_HEIGHT // 2 + 100), \
-        110, 40), 'ENTER')
-        
-        allButtons = (abutton, bbutton, cbutton, dbutton, ebutton\
-                        ,fbutton, gbutton, hbutton, ibutton, jbutton\
-                        ,kbutton, lbutton, mbutton, nbutton, obutton\
-                        ,pbutton, qbutton, rbutton, sbutton, tbutton\
-                        ,ubutton, vbutton, wbutton, xbutton, ybutton\
-                        ,zbutton, deletebutton, enterbutton)
-
-        #create initials variable to be printed to screen later
-        initials = []
-        initialstext = self.font.render(str(initials),True\
-                                                ,self.BROWN)
-        while True:
-            for event in pygame.event.get():
-                if event.type == QUIT or \
-                   (event.type == KEYDOWN and event.key == K_ESCAPE) or\
-                    (event.type == JOYBUTTONDOWN and event.dict == {'joy': 0, 'button': 1}):
-                    return False
-                #detects clicks in buttons and appends that letter to initials
-                if 'click' in abutton.handleEvent(event):
-                    initials.append("A")
-                if 'click' in bbutton.handleEvent(event):
-                    initials.append("B")
-                if 'click' in cbutton.handleEvent(event):
-                    initials.append("C")
-                if 'click' in dbutton.handleEvent(event):
-                    initials.append("D")
-                if 'click' in ebutton.handleEvent(event):
-                    initials.append("E")
-                if 'click' in fbutton.handleEvent(event):
-                    initials.append("F")
-                if 'click' in gbutton.handleEvent(event):
-                    initials.append("G")
-                if 'click' in hbutton.handleEvent(event):
-                    initials.append("H")
-                if 'click' in ibutton.handleEvent(event):
-                    initials.append("I")
-                if 'click' in jbutton.handleEvent(event):
-                    initials.append("J")
-                if 'click' in kbutton.handleEvent(event):
-                    initials.append("K")
-                if 'click' in lbutton.handleEvent(event):
-                    initials.append("L")
-                if 'click' in mbutton.handleEvent(event):
-                    initials.append("M")
-                if 'click' in nbutton.handleEvent(event):
-                    initials.append("N")
-                if 'click' in obutton.handleEvent(event):
-                    initials.append("O")
-                if 'click' in pbutton.handleEvent(event):
-                    initials.append("P")
-                if 'click' in qbutton.handleEvent(event):
-                    initials.append("Q")
-                if 'click' in rbutton.handleEvent(event):
-                    initials.append("R")
-                if 'click' in sbutton.handleEvent(event):
-                    initials.append("S")
-                if 'click' in tbutton.handleEvent(event):
-                    initials.append("T")
-                if 'click' in ubutton.handleEvent(event):
-                    initials.append("U")
-                if 'click' in vbutton.handleEvent(event):
-                    initials.append("V")
-                if 'click' in wbutton.handleEvent(event):
-                    initials.append("W")
-                if 'click' in xbutton.handleEvent(event):
-                    initials.append("X")
-                if 'click' in ybutton.handleEvent(event):
-                    initials.append("Y")
-                if 'click' in zbutton.handleEvent(event):
-                    initials.append("Z")
-                #remove last letter inputted into initials if delete is pressed
-                if 'click' in deletebutton.handleEvent(event):
-                    if len(initials) != 0:
-                        initials.remove(initials[-1])
-                #if entered, sets the initials variable to the game class for
-                #later use and quits from the enter name screen
-                if 'click' in enterbutton.handleEvent(event):
-                    if len(initials) == 3:
-                        self.initialsname = ".".join(initials)
-                        return False
-                #for initials if length is zero, draw a blank rectangle
-                if len(initials) == 0:
-                    pygame.draw.rect(screen, self.CREAM, [350,220,100,25], 0)
-                #draw intials to screen if anything has been added or taken away from the string
-                if len(initials) == 1:
-                    pygame.draw.rect(screen, self.CREAM, [350,220,100,25], 0)
-                    firstinitial = ("".join(initials))
-                    initialstext = self.font.render(str(firstinitial),True\
-                                                ,self.BROWN)                    
-                    screen.blit(initialstext, [HALF_WIDTH - \
-                                                   initialstext.get_width()//2, 225])
-                if len(initials) == 2:
-                    pygame.draw.rect(screen, self.CREAM, [350,220,100,25], 0)
-                    twoinitial = (".".join(initials))
-                    initialstext = self.font.render(str(twoinitial),True\
-                                                ,self.BROWN)                    
-                    screen.blit(initialstext, [HALF_WIDTH - \
-                                                   initialstext.get_width()//2 , 225])
-                if len(initials) == 3:
-                    pygame.draw.rect(screen, self.CREAM, [350,220,100,25], 0)                    
-                    threeinitial = (".".join(initials))
-                    initialstext = self.font.render(str(threeinitial),True\
-                                                ,self.BROWN)
-                    screen.blit(initialstext, [HALF_WIDTH - \
-                                                   initialstext.get_width()//2 , 225])
-                #dont let initials get longer than 3 letters long
-                if len(initials) == 4:
-                    initials = initials[0:3]
-
-            #blit buttons and text within update loop
-            screen.blit(mainmenutext, [SCREEN_WIDTH // 2 -\
-                    (mainmenutext.get_width() // 2) , 150])
-            for b in allButtons:
-                    b.draw(screen)
-                
-            pygame.display.update()
+        110, 40), 'ENTER'))
+        #the initials are drawn centred, clearing the space they go in first
+        entername.add_label('initials', ui.Label(self.font, self.BROWN, \
+                                    [HALF_WIDTH, 225], [350,220,100,25]))
+        return entername
+
+    def entername_screen(self,screen):
+        """Screen with a keyboard of buttons for player to enter name with"""
+        entername = self.uiscreen('entername')
+        self.initials = []
+        entername.labels['initials'].set("")
+        entername.show(screen)
+
+    def entername_logic(self, events):
+        """Adds or removes letters from the initials as buttons are clicked,
+        going to the high scores once three have been entered"""
+        entername = self.uiscreen('entername')
+        if controls.actions.was_pressed(controls.QUIT | controls.BACK):
+            return 'highscores'
+        for event in events:
+            clicked = entername.handle(event)
+            #detects clicks in buttons and appends that letter to initials
+            for name in clicked:
+                if len(name) == 1:
+                    self.initials.append(name)
+            #remove last letter inputted into initials if delete is pressed
+            if 'delete' in clicked:
+                if len(self.initials) != 0:
+                    self.initials.remove(self.initials[-1])
+            #if entered, sets the initials variable to the game class for
+            #later use and quits from the enter name screen
+            if 'enter' in clicked:
+                if len(self.initials) == 3:
+                    self.initialsname = ".".join(self.initials)
+                    return 'highscores'
+            #dont let initials get longer than 3 letters long
+            if len(self.initials) == 4:
+                self.initials = self.initials[0:3]
+            entername.labels['initials'].set(".".join(self.initials))
+        return None
 
     def highscore_screen(self,screen):
         """If player has entered name, new high scores appear and player can then
         quit game"""
         #setup graphics and text variables
-        menubg = pygame.image.load("menuscreen.bmp")
+        menubg = assets.images.load("menuscreen.bmp")
         bgrect = menubg.get_rect()
         screen.blit(menubg, bgrect)
         pygame.draw.rect(screen, self.CREAM, [160,95,485,455], 0)
@@ -1149,7 +859,6 @@ class Game():
                 f.close()
                 #creates final FINALLIST variable
                 FINALLIST = " ---- "+(" ---- ".join(FINALLIST))+" ---- "
-                self.listcomplete = True
 
         #create text variables
         highscoretitle = self.mediumfont.render("Highscores"\
@@ -1175,14 +884,11 @@ class Game():
 
 
     def highscore_logic(self):
-        #self.__init__() will quit game at this point as in the loop, running
-        #will already be set to false - see below
-        keys = pygame.key.get_pressed()
-        for e in pygame.event.get():
-            if e.type == QUIT or keys[pygame.K_ESCAPE] or \
-                (e.type == JOYBUTTONDOWN and e.dict == {'button': 13, 'joy': 0}):               
-                self.__init__()
-        return True
+        """The high scores are the last screen, detects when the player wants
+        to quit"""
+        if controls.actions.was_pressed(controls.QUIT | controls.BACK):
+            return 'quit'
+        return None
                                 
 
 def game_run():
@@ -1193,87 +899,25 @@ def game_run():
     #set pygame display
     screen = pygame.display.set_mode(SIZE, FLAGS, DEPTH)
     pygame.display.set_caption('JUNGLE RUN!')
+    #use the controls file if there is one
+    controls.actions.bind(controls.load_bindings())
     #create instance of Game class
     game = Game()
-    #create running loop variable - when it ends, pygame quits
-    running = True
-    #play music then loop round game until it is quit
+    #record what the player does while playing, so if something goes wrong
+    #the game can be played back exactly with replay.py
+    recording = replay.Recording(game.levelnumber, game.lives, game.levelscore)
+    #play music then run the game's scenes, starting with the main menu,
+    #until one of them quits
     pygame.mixer.music.play(-1)
-    #create running loop, run game and check for if running is true
-    while running:
-        running = game.game_logic()
-        game.display_update(screen)
-        #while mainmenu run mainmenu with logic, if it goes into instructions
-        #then run instructions with logic, if it goes into the game then
-        #these variables will be set to false and it will go back to the
-        #game running loop
-        while game.mainmenu:
-            running = game.menuscreen(screen)
-            while game.instructions:
-                running = game.instruction_screen(screen)
-                if running == False:
-                    game.instructions = False
-            if running == False:
-                game.mainmenu = False
-        #if game paused, then game pause loop activates, print pause once, then
-        #checking for either an unpause or a quit
-        while game.gamepause_loop:
-            while game.gamepaused:
-                game.gamepause_screen(screen)
-                game.gamepaused = False
-                break
-            running = game.gamepause_logic()
-            #quits pause loop but can either be running or not affecting next logic
-            if running == True:
-                game.gamepause_loop = False
-            if running == False:
-                game.gamepause_loop = False
-        #if level complete, start levelcomplete loop, which prints
-        #level complete UI to the screen once, then checks for button presses to
-        #break out of the loop
-        while game.levelcompleteloop:
-            while game.levelcomplete:
-                if game.levelnumber < 3:
-                    game.level_complete_screen(screen)
-                    game.levelcomplete = False
-                    time.sleep(1)
-                    break
-            running = game.level_complete_logic()
-            if not running:
-                game.levelcompleteloop = False                
-        #if level complete, start levelcomplete loop, which prints
-        #level complete UI to the screen once, then checks for button presses to
-        #break out of the loop - to quit or restart game
-        while game.gameoverloop:
-            while game.gameover:
-                game.game_over_screen(screen)
-                game.gameover = False
-                time.sleep(1)
-                break
-            running = game.game_over_logic()
-            if not running:
-                game.gameoverloop = False
-        #set game complete loop up with game complete screen and options to quit
-        #or go to enter name screen
-        while game.gamecomplete:
-            game.gamecomplete_screen(screen)
-            running = game.gamecomplete_logic()
-            if game.enternamescreen:
-                game.gamecomplete = False
-            if not running:
-                game.gamecomplete = False
-        #start new loop to enter name, if you enter name, the else statement
-        #will be activated and the game will show you your score. Then
-        #when the user presses quit, the game will quit as running has already been
-        #set to false
-        while game.enternamescreen:
-            if running:
-                running = game.entername_screen(screen)
-            else:
-                if not game.listcomplete:
-                    game.highscore_screen(screen)
-                game.highscore_logic()
+    director = scenes.Director(screen, scenes.game_scenes(game, recording), \
+                               'menu')
+    #save the recording even if the game crashes, that is when it is needed
+    try:
+        director.run()
+    finally:
+        recording.save(replay.REPLAY_FILE)
 
     pygame.quit()
     
-game_run()
+if __name__ == "__main__":
+    game_run()
@@ -0,0 +1,60 @@
+import collections
+import pygame
+
+#how many bytes of images the cache holds on to before it starts dropping
+#the ones that haven't been used for the longest
+BUDGET = 32 * 1024 * 1024
+
+def display_format(surface, alpha=False):
+    """Converts a surface to the same pixel format as the screen, so it
+    doesn't have to be converted again every time it is blitted. Surfaces
+    with see through parts need alpha set to keep them. Without a display
+    (e.g. running headless) the surface is returned as it is"""
+    if pygame.display.get_surface() is None:
+        return surface
+    if alpha:
+        return surface.convert_alpha()
+    return surface.convert()
+
+class AssetCache(object):
+    """Loads each image file once and keeps the converted surface, so the
+    menus and levels don't load the same file over and over. Once the images
+    add up to more than budget bytes the least recently used ones are
+    dropped, and get loaded again if they are needed later"""
+    def __init__(self, budget=BUDGET):
+        self.budget = budget
+        self.size = 0
+        #keyed by (filename, alpha), oldest used first
+        self.surfaces = collections.OrderedDict()
+
+    def load(self, filename, alpha=False):
+        """Returns the image in filename, converted for the display"""
+        key = (filename, alpha)
+        if key in self.surfaces:
+            self.surfaces.move_to_end(key)
+            return self.surfaces[key]
+        surface = display_format(pygame.image.load(filename), alpha)
+        self.surfaces[key] = surface
+        self.size += self.bytes(surface)
+        self.trim()
+        return surface
+
+    def discard(self, filename):
+        """Drops a file's images from the cache, e.g. a level background
+        once the level is finished with it"""
+        for key in [key for key in self.surfaces if key[0] == filename]:
+            self.size -= self.bytes(self.surfaces.pop(key))
+
+    def trim(self):
+        """Drops the least recently used images until the cache fits in its
+        budget. The newest image is always kept, even if it is over budget
+        on its own"""
+        while self.size > self.budget and len(self.surfaces) > 1:
+            key, surface = self.surfaces.popitem(last=False)
+            self.size -= self.bytes(surface)
+
+    def bytes(self, surface):
+        return surface.get_pitch() * surface.get_height()
+
+#the cache everything in the game loads its images through
+images = AssetCache()
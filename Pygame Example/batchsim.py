@@ -0,0 +1,249 @@
+import sys
+import time
+import numpy
+import controls
+import levels
+
+#the size of a level tile and of the player's rect, every frame of the
+#player's animation is the same size so the rect never changes
+TILE = 32
+PLAYER_SIZE = 64
+
+#the numbers PLAYER.update moves the player by each step
+WALK_SPEED = 8
+JUMP_SPEED = 11
+GRAVITY = 0.7
+MAX_FALL = 100
+JUMPPAD_SPEED = 20
+
+def pygame_round(values):
+    """Rounds the way pygame does when a float is put into a Rect, which is
+    to the nearest whole number with halves going away from zero"""
+    whole = numpy.trunc(values)
+    #taking the whole part away leaves the exact fraction
+    fraction = values - whole
+    return (whole + (fraction >= 0.5) - (fraction <= -0.5)).astype(numpy.int64)
+
+#empty tiles added all the way round a level's tile grids, enough that a rect
+#off the edge of the level only ever looks up empty tiles
+BORDER = PLAYER_SIZE // TILE + 1
+
+def tile_grid(level, letters):
+    """Returns a boolean array of which tiles in the level are one of
+    letters, with a BORDER of empty tiles all the way round"""
+    grid = numpy.zeros((len(level) + 2 * BORDER, len(level[0]) + 2 * BORDER), \
+                       dtype=bool)
+    for y, row in enumerate(level):
+        for x, letter in enumerate(row):
+            if letter in letters:
+                grid[y + BORDER, x + BORDER] = True
+    return grid
+
+def runs(grid, length, axis):
+    """Returns whether any of the length tiles starting at each tile and
+    going down (axis 0) or across (axis 1) are set"""
+    found = grid.copy()
+    for i in range(1, length):
+        if axis == 0:
+            found[:-i] |= grid[i:]
+        else:
+            found[:, :-i] |= grid[:, i:]
+    return found
+
+class TileGrid(object):
+    """A tile grid made by tile_grid, with tables for finding which of its
+    tiles a player's rect overlaps in one lookup rather than checking each
+    tile. A rect lined up with the tiles overlaps PLAYER_SIZE // TILE of
+    them each way and otherwise one more, so the tables are kept for both
+    and picked between by whether the rect is lined up"""
+    def __init__(self, grid):
+        self.grid = grid
+        self.span = PLAYER_SIZE // TILE + 1
+        lengths = (self.span - 1, self.span)
+        #down[lined up, row, column] is whether any tile in the rows a rect
+        #with its top in row overlaps is set in column, across is the same
+        #for columns and blocks for every tile the rect overlaps
+        self.down = numpy.array([runs(grid, n, 0) for n in lengths])
+        self.across = numpy.array([runs(grid, n, 1) for n in lengths])
+        self.blocks = numpy.array([[runs(runs(grid, down, 0), across, 1) \
+                                    for down in lengths] for across in lengths])
+
+    def find(self, x, y):
+        """Returns the column and row of the tile under the top left of each
+        rect, and 1 where the rect is not lined up across or down"""
+        rows, cols = self.grid.shape
+        col = numpy.minimum(numpy.maximum(x // TILE + BORDER, 0), cols - 1)
+        row = numpy.minimum(numpy.maximum(y // TILE + BORDER, 0), rows - 1)
+        return col, row, (x % TILE != 0) * 1, (y % TILE != 0) * 1
+
+    def touching(self, x, y):
+        """True for each rect that overlaps a set tile"""
+        col, row, acrossmore, downmore = self.find(x, y)
+        return self.blocks[acrossmore, downmore, row, col]
+
+    def columns(self, x, y):
+        """Returns an (n, span) array of whether each column a rect overlaps,
+        left to right, has a set tile in the rows it overlaps"""
+        col, row, acrossmore, downmore = self.find(x, y)
+        last = self.grid.shape[1] - 1
+        return numpy.stack([self.down[downmore, row, \
+                            numpy.minimum(col + i, last)] & \
+                            (i < self.span - 1 + acrossmore) \
+                            for i in range(self.span)], axis=1)
+
+    def rows(self, x, y):
+        """Returns an (n, span) array of whether each row a rect overlaps,
+        top to bottom, has a set tile in the columns it overlaps"""
+        col, row, acrossmore, downmore = self.find(x, y)
+        last = self.grid.shape[0] - 1
+        return numpy.stack([self.across[acrossmore, \
+                            numpy.minimum(row + j, last), col] & \
+                            (j < self.span - 1 + downmore) \
+                            for j in range(self.span)], axis=1)
+
+class Batch(object):
+    """Many players on the same level, simulated together. Each player's
+    rect, velocity and whether it is on the ground, dead or through the
+    door are held in arrays, and every step moves all of them at once with
+    the same rules as PLAYER.update and PLAYER.collide: walking, jumping,
+    gravity, landing on and bumping into platforms, fallblocks, jumppads and
+    the exit door. Enemies, coins and hearts are not simulated, so this is
+    for working out where players can get to, not for playing the game"""
+    def __init__(self, level, n, start):
+        """level is a list of row strings like those in levels.py, start is
+        where the centre of every player begins"""
+        self.level = level
+        self.n = n
+        self.solid = TileGrid(tile_grid(level, "P"))
+        self.fall = TileGrid(tile_grid(level, "F"))
+        #the door is two tiles tall, the tile its letter is on and the one
+        #below
+        exits = tile_grid(level, "X")
+        exits[1:] |= exits[:-1].copy()
+        self.exit = TileGrid(exits)
+        pads = numpy.argwhere(tile_grid(level, "J")) - BORDER
+        #(left, top) of each jumppad, in the order the level builder adds
+        #them to the trigger layer
+        self.pads = [(x * TILE, y * TILE) for y, x in pads]
+        self.reset(start)
+
+    def reset(self, start):
+        """Puts every player back at start, standing still in the air"""
+        n = self.n
+        self.x = numpy.full(n, start[0] - PLAYER_SIZE // 2, dtype=numpy.int64)
+        self.y = numpy.full(n, start[1] - PLAYER_SIZE // 2, dtype=numpy.int64)
+        self.vx = numpy.zeros(n, dtype=numpy.int64)
+        self.vy = numpy.zeros(n)
+        self.onground = numpy.zeros(n, dtype=bool)
+        self.alive = numpy.ones(n, dtype=bool)
+        self.complete = numpy.zeros(n, dtype=bool)
+
+    def place(self, x, y, vy, onground):
+        """Replaces the players with one for each rect position, vertical
+        speed and on the ground flag given, all alive and still playing"""
+        self.n = len(x)
+        self.x = numpy.asarray(x, dtype=numpy.int64)
+        self.y = numpy.asarray(y, dtype=numpy.int64)
+        self.vx = numpy.zeros(self.n, dtype=numpy.int64)
+        self.vy = numpy.asarray(vy, dtype=float)
+        self.onground = numpy.asarray(onground, dtype=bool)
+        self.alive = numpy.ones(self.n, dtype=bool)
+        self.complete = numpy.zeros(self.n, dtype=bool)
+
+    def step(self, actions):
+        """Moves every player that is still playing on one step. actions is
+        the controls bits each player is holding, one number for all of them
+        or an array with one per player"""
+        actions = numpy.broadcast_to(numpy.asarray(actions), (self.n,))
+        up = actions & controls.JUMP != 0
+        left = actions & controls.LEFT != 0
+        right = actions & controls.RIGHT != 0
+        active = self.alive & ~self.complete
+        x = self.x
+        y = self.y
+        vy = self.vy.copy()
+        onground = self.onground.copy()
+
+        #only jump if on the ground
+        jumping = up & onground
+        vy[jumping] -= JUMP_SPEED
+        onground[jumping] = False
+        #right wins if both are held, like in PLAYER.update
+        vx = numpy.where(right, WALK_SPEED, numpy.where(left, -WALK_SPEED, 0))
+        #gravity against the jump, up to the max falling speed
+        falling = ~onground
+        vy[falling] += GRAVITY
+        vy[falling] = numpy.minimum(vy[falling], MAX_FALL)
+
+        #the triggers are checked where the player was before it moves
+        fell = self.fall.touching(x, y)
+        exited = self.exit.touching(x, y)
+
+        #move across and stop at the first platform in the way
+        x = x + vx
+        across = self.solid.columns(x, y)
+        hit = across.any(axis=1)
+        first = across.argmax(axis=1)
+        last = across.shape[1] - 1 - across[:, ::-1].argmax(axis=1)
+        column = x // TILE
+        x = numpy.where(hit & (vx > 0), (column + first) * TILE - PLAYER_SIZE, x)
+        x = numpy.where(hit & (vx < 0), (column + last + 1) * TILE, x)
+
+        #move down or up and land on or bump into the first platform
+        y = pygame_round(y + vy)
+        onground[:] = False
+        down = self.solid.rows(x, y)
+        hit = down.any(axis=1)
+        first = down.argmax(axis=1)
+        last = down.shape[1] - 1 - down[:, ::-1].argmax(axis=1)
+        row = y // TILE
+        landed = hit & (vy > 0)
+        y = numpy.where(landed, (row + first) * TILE - PLAYER_SIZE, y)
+        y = numpy.where(hit & (vy < 0), (row + last + 1) * TILE, y)
+        onground |= landed
+        vy[landed] = 0
+
+        #jumppads, checked with the speed left after landing. The player
+        #bounces off a pad it falls onto or is standing level with. Which
+        #pads are near enough to check is worked out before any of them
+        #move the player, with the rect grown by a tile either side and a
+        #pixel above and below
+        speed = vy.copy()
+        nearby = [(x - TILE < padx + TILE) & (x + PLAYER_SIZE + TILE > padx) \
+                  & (y - 1 < pady + TILE) & (y + PLAYER_SIZE + 1 > pady) \
+                  for padx, pady in self.pads]
+        for (padx, pady), near in zip(self.pads, nearby):
+            onto = near & (x < padx + TILE) & (x + PLAYER_SIZE > padx) & \
+                   (y < pady + TILE) & (y + PLAYER_SIZE > pady) & (speed > 0)
+            y = numpy.where(onto, pady - PLAYER_SIZE, y)
+            vy[onto] = -JUMPPAD_SPEED
+            beside = near & (padx - 30 < x) & (x < padx + 30) & \
+                     (y + PLAYER_SIZE == pady)
+            vy[beside] = -JUMPPAD_SPEED
+
+        #players that have died or finished stay where they are
+        self.x = numpy.where(active, x, self.x)
+        self.y = numpy.where(active, y, self.y)
+        self.vx = numpy.where(active, vx, self.vx)
+        self.vy = numpy.where(active, vy, self.vy)
+        self.onground = numpy.where(active, onground, self.onground)
+        self.alive &= ~(active & fell)
+        self.complete |= active & exited
+
+def benchmark(n=10000, steps=300, levelnumber=1):
+    """Times n players holding random controls for steps steps, returns
+    player steps per second"""
+    batch = Batch(levels.LEVELS[levelnumber], n, levels.STARTS[levelnumber])
+    moves = numpy.array([0, controls.LEFT, controls.RIGHT, controls.JUMP, \
+                         controls.LEFT | controls.JUMP, \
+                         controls.RIGHT | controls.JUMP])
+    random = numpy.random.RandomState(0)
+    actions = moves[random.randint(len(moves), size=(steps, n))]
+    start = time.perf_counter()
+    for step in range(steps):
+        batch.step(actions[step])
+    return n * steps / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print("{0:.0f} player steps a second".format(benchmark(n)))
@@ -0,0 +1,172 @@
+import pygame
+
+#the actions the game understands. Each is one bit, so the actions held
+#down at any moment fit in one number
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+PAUSE = 8
+QUIT = 16
+SELECT = 32
+BACK = 64
+RESTART = 128
+INSTRUCTIONS = 256
+
+ACTIONS = {'left': LEFT, 'right': RIGHT, 'jump': JUMP, 'pause': PAUSE,
+           'quit': QUIT, 'select': SELECT, 'back': BACK,
+           'restart': RESTART, 'instructions': INSTRUCTIONS}
+
+#the default controls, laid out like the translation tables in ps3trial:
+#event type -> key or controller button -> action. The buttons are the ps3
+#controller's, 14 is X, 13 is O, 15 is square, 3 is start and 0 is select
+DEFAULT_BINDINGS = {
+    pygame.KEYDOWN: {
+        pygame.K_LEFT: LEFT,
+        pygame.K_RIGHT: RIGHT,
+        pygame.K_UP: JUMP,
+        pygame.K_SPACE: JUMP | SELECT,
+        pygame.K_p: PAUSE,
+        pygame.K_ESCAPE: QUIT,
+        pygame.K_r: RESTART,
+    },
+    pygame.JOYBUTTONDOWN: {
+        7: LEFT,
+        5: RIGHT,
+        14: JUMP | SELECT,
+        3: PAUSE,
+        0: QUIT,
+        13: BACK,
+        15: RESTART | INSTRUCTIONS,
+    }
+}
+
+#if this file exists it replaces the default controls. Each line is an
+#action, then key and a key name, or button and a button number, e.g.
+#   jump key up
+#   jump button 14
+#The file replaces all of the defaults, not just the actions in it, so an
+#action left out (even pause or quit) has no key or button at all
+BINDINGS_FILE = "controls.txt"
+
+def read_binding(line):
+    """Reads one line of a controls file. Returns (event type, key or
+    button, action), or None with the reason printed if it can't be read"""
+    words = line.split()
+    if len(words) != 3:
+        print("controls: expected action, key or button, and a name in " \
+              "{0!r}, skipped".format(line.strip()))
+        return None
+    action, kind, name = words
+    if action not in ACTIONS:
+        print("controls: no action called {0!r}, skipped".format(action))
+        return None
+    if kind == "key":
+        try:
+            return pygame.KEYDOWN, pygame.key.key_code(name), ACTIONS[action]
+        except ValueError:
+            print("controls: no key called {0!r}, skipped".format(name))
+            return None
+    if kind == "button":
+        if name.isdigit():
+            return pygame.JOYBUTTONDOWN, int(name), ACTIONS[action]
+        print("controls: {0!r} is not a button number, skipped".format(name))
+        return None
+    print("controls: {0!r} is not key or button, skipped".format(kind))
+    return None
+
+def load_bindings(filename=BINDINGS_FILE):
+    """Reads the controls from filename into the same layout as
+    DEFAULT_BINDINGS, or returns DEFAULT_BINDINGS if there is no file. Lines
+    that can't be read are skipped with a warning, and if none can be read
+    the defaults are used, so a mistake in the file never leaves the game
+    with no controls at all"""
+    try:
+        f = open(filename, "r")
+    except IOError:
+        return DEFAULT_BINDINGS
+    bindings = {pygame.KEYDOWN: {}, pygame.JOYBUTTONDOWN: {}}
+    found = False
+    for line in f:
+        #blank lines are allowed between the bindings
+        if not line.strip():
+            continue
+        binding = read_binding(line)
+        if binding is None:
+            continue
+        kind, code, action = binding
+        table = bindings[kind]
+        table[code] = table.get(code, 0) | action
+        found = True
+    f.close()
+    if not found:
+        print("controls: nothing in {0} could be read, using the default " \
+              "controls".format(filename))
+        return DEFAULT_BINDINGS
+    return bindings
+
+def compile_bindings(bindings):
+    """Flattens the bindings into one dictionary of (event type, key or
+    button) -> actions, with the release events looking up the same actions
+    as the press events, so each event needs one lookup"""
+    table = {}
+    for key, actions in bindings.get(pygame.KEYDOWN, {}).items():
+        table[(pygame.KEYDOWN, key)] = actions
+        table[(pygame.KEYUP, key)] = actions
+    for button, actions in bindings.get(pygame.JOYBUTTONDOWN, {}).items():
+        table[(pygame.JOYBUTTONDOWN, button)] = actions
+        table[(pygame.JOYBUTTONUP, button)] = actions
+    return table
+
+class Controls(object):
+    """Turns each frame's events into actions, shared by every screen so
+    none of them have to check for particular keys or buttons. held is the
+    actions whose keys or buttons are down, pressed is the ones that went
+    down this frame"""
+    def __init__(self, bindings=DEFAULT_BINDINGS):
+        self.bind(bindings)
+        self.held = 0
+        self.pressed = 0
+
+    def bind(self, bindings):
+        """Changes the controls to bindings, laid out like DEFAULT_BINDINGS"""
+        self.table = compile_bindings(bindings)
+
+    def update(self, events):
+        """Reads one frame's events, called by the Director before each
+        scene update"""
+        self.pressed = 0
+        for e in events:
+            if e.type == pygame.KEYDOWN or e.type == pygame.KEYUP:
+                actions = self.table.get((e.type, e.key), 0)
+            elif e.type == pygame.JOYBUTTONDOWN or e.type == pygame.JOYBUTTONUP:
+                actions = self.table.get((e.type, e.button), 0)
+            elif e.type == pygame.QUIT:
+                #closing the window always quits
+                self.pressed |= QUIT
+                continue
+            else:
+                continue
+            if e.type == pygame.KEYDOWN or e.type == pygame.JOYBUTTONDOWN:
+                self.held |= actions
+                self.pressed |= actions
+            else:
+                self.held &= ~actions
+
+    def release(self):
+        """Forgets every key and button held down, so one held in the last
+        screen, e.g. space picking Play, doesn't carry on into the next one
+        as a different action, e.g. jump. It has to be pressed again"""
+        self.held = 0
+        self.pressed = 0
+
+    def was_pressed(self, actions):
+        """True if any of the actions went down this frame"""
+        return self.pressed & actions != 0
+
+    def is_held(self, actions):
+        """True if any of the actions are held down"""
+        return self.held & actions != 0
+
+#the controls every screen reads from, game_run loads any controls file into
+#it once pygame has started
+actions = Controls()
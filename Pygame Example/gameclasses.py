@@ -1,5 +1,6 @@
+import io
+import zipfile
 import pygame
-from easypg import colours
 from easypg.sprites import Sprite
 
 #screen variables used in camera settings
@@ -9,13 +10,75 @@ HALF_WIDTH = int(SCREEN_WIDTH / 2)
 HALF_HEIGHT = int(SCREEN_HEIGHT / 2)
 
 SIZE = [SCREEN_WIDTH,SCREEN_HEIGHT]
-screen = pygame.display.set_mode(SIZE)
 
+#how many times a second the game is simulated. The player and enemy speeds
+#and gravity are all per step, so they assume this rate
+TICK_RATE = 30
+#how far an enemy walks left and right of where it starts, if the ground
+#it stands on goes that far
+PATROL_LEFT = 40
+PATROL_RIGHT = 110
+#easypg sprites only use the screen they are given to find its size, so a
+#plain surface the same size stands in for it and no window has to be open
+screen = pygame.Surface(SIZE)
 
-class PLAYER(Sprite):
+
+class SharedSprite(Sprite):
+    """easypg loads the whole zip of images every time a Sprite is made and
+    adds them onto the class's images again. This only loads them the first
+    time, so every player and enemy after that shares the same images.
+
+    A collision mask and the box around its solid pixels are also made for
+    every frame when the images load, so mask always matches the frame being
+    shown. Like images, masks must be defined as a dictionary in each
+    subclass"""
+    def _load_from_zip(self, path):
+        if not self.images:
+            if pygame.display.get_surface() is None:
+                self._load_headless(path)
+            else:
+                super()._load_from_zip(path)
+            for directions in self.images.values():
+                for sequence in directions.values():
+                    for image in sequence:
+                        mask = pygame.mask.from_surface(image)
+                        #join the boxes around each solid part of the mask
+                        boxes = mask.get_bounding_rects()
+                        if boxes:
+                            bounds = boxes[0].unionall(boxes[1:])
+                        else:
+                            bounds = pygame.rect.Rect(0, 0, 0, 0)
+                        self.masks[image] = (mask, bounds)
+
+    def _load_headless(self, path):
+        """Loads the images like easypg does but without a display to convert
+        them for. Copying just the colours leaves the same pixels convert
+        would, so the colour key and masks come out the same"""
+        archive = zipfile.ZipFile(path)
+        contents = sorted(archive.namelist())
+        for (state, direction, _), name in self._find_images(contents):
+            image = pygame.image.load(io.BytesIO(archive.open(name).read()))
+            image = pygame.image.fromstring(pygame.image.tostring(image, \
+                                            'RGB'), image.get_size(), 'RGB')
+            self._set_background(image)
+            self.images[state][direction].append(image)
+
+    @property
+    def mask(self):
+        return self.masks[self.image][0]
+
+    def mask_rect(self):
+        """Returns the box around the current frame's solid pixels, placed
+        where the sprite is. Masks line up with the top left of rect, which
+        is not always the same size as the image"""
+        return self.masks[self.image][1].move(self.rect.topleft)
+
+
+class PLAYER(SharedSprite):
     """Player class detects movement of player, collisions and animation
     states the player should be in"""
     images = {}
+    masks = {}
     def __init__(self, x, y):
         #http://www.vg-resource.com/archive/index.php?thread-23452-8.html
         #This is where the character spritesheet is to find
@@ -36,12 +99,12 @@ class PLAYER(Sprite):
         self.levelcomplete = False
         #variable for bouncing on jumppad
         self.bounce = False
+        #what happened to the player this step that the game might play a
+        #sound for, e.g. 'coin'. The world empties it after every step
+        self.events = []
 
-        self.mask = pygame.mask.from_surface(self.image)
-
-    def update(self, up, down, left, right, platforms, fallblocks, fallsound,\
-               jumppads, boing, collectibles, ding, enemies, enemydeath_sound, \
-               exitdoor, allsprites, heartlist):
+    def update(self, up, down, left, right, platforms, triggers, enemies, \
+               allsprites):
         """Update is passed all information from running game to see what
         the player update should do"""
         #the following logic detects different states of the player - whether
@@ -129,33 +192,35 @@ class PLAYER(Sprite):
                 self.vy = -20
         if not(left or right):
             self.vx = 0
+        #find every fallblock, coin, heart and door the player is touching
+        #with one check of the trigger layer, then deal with each kind
+        touching = triggers.touching(self.rect)
         #check for if player has fallen off screen
-        self.fall(fallblocks, fallsound)
+        self.fall(touching, triggers)
         #check for if collectible is collected
-        self.collect_coin(collectibles, allsprites, ding)
+        self.collect_coin(touching, triggers, allsprites)
         #check for extra life collected
-        self.collect_life(heartlist, allsprites, ding)
+        self.collect_life(touching, triggers, allsprites)
         #check for if player walks through the exit door
-        self.exit_level(exitdoor)
+        self.exit_level(touching, triggers)
         #create x velocity and check for collisions
         self.rect.left += self.vx
         self.collide(self.vx, 0, platforms)
-        self.enemy_collide(self.vx, 0, enemies, enemydeath_sound,\
-                            allsprites)
+        self.enemy_collide(self.vx, 0, enemies, allsprites)
         #create y velocity and check for collisions if in the air
         self.rect.top += self.vy
         self.onGround = False;
         self.collide(0, self.vy, platforms)
-        self.jumppad_collide(0, self.vy, jumppads, boing)
+        self.jumppad_collide(0, self.vy, triggers)
         #check for if player is killed or kills an enemy
-        self.enemy_collide(0, self.vy, enemies, enemydeath_sound,\
-                        allsprites)
+        self.enemy_collide(0, self.vy, enemies, allsprites)
 
     def collide(self, vx, vy, platforms):
         """Check if player collides with platform and which direction he is
         going in, in which the player position is then set by which side
-        collided"""
-        for p in platforms:
+        collided. platforms is the level's SpatialGrid so only the platforms
+        near the player are checked"""
+        for p in platforms.query(self.rect):
             if pygame.sprite.collide_rect(self, p):
                 if vx > 0:
                     self.rect.right = p.rect.left
@@ -168,31 +233,36 @@ class PLAYER(Sprite):
                 if vy < 0:
                     self.rect.top = p.rect.bottom
 
-    def jumppad_collide(self, vx, vy, jumppads, boing):
+    def jumppad_collide(self, vx, vy, triggers):
         """Checks player collision with a jump pad, which then makes the player
         bounce in the air"""
-        for p in jumppads:
+        #the player also bounces off a pad it is standing next to, so look
+        #a little way either side of and below the player for pads
+        nearby = triggers.touching(self.rect.inflate(64, 2))
+        for p in nearby.get(triggers.JUMPPAD, ()):
             if pygame.sprite.collide_rect(self, p):
                 if vy > 0:
                     self.rect.bottom = p.rect.top
                     self.vy = -20
-                    boing.play()
+                    self.events.append('jumppad')
                     self.bounce = True
             if p.rect.left-30 < self.rect.left < p.rect.left+30:
                 if self.rect.bottom == p.rect.top:
                     self.vy = -20
-                    boing.play()
+                    self.events.append('jumppad')
                     self.bounce = True
 
-    def enemy_collide(self, vx, vy, enemies, enemydeath_sound,\
-                      allsprites):
+    def enemy_collide(self, vx, vy, enemies, allsprites):
         """The values in self.vy and self.vx statements were a lot of trial and
         error as there is no easy way in pygameto detect if the player landed on
         an enemies head."""
         for e in enemies:
-            if pygame.sprite.collide_mask(self, e):
+            #only do the pixel perfect check if the boxes around the solid
+            #pixels overlap, which rules out nearly every enemy straight away
+            if self.mask_rect().colliderect(e.mask_rect()) and \
+               pygame.sprite.collide_mask(self, e):
                 if vy > 0:
-                    enemydeath_sound.play()
+                    self.events.append('enemykilled')
                     self.vy = -11
                     enemies.remove(e)
                     allsprites.remove(e)
@@ -205,64 +275,124 @@ class PLAYER(Sprite):
                     if vy == 0:
                         self.playerdeath = True
 
-    def collect_coin(self, collectibles, allsprites, ding):
-        """Detects and removes coin if collided and collected by player"""
-        for c in collectibles:
-            if pygame.sprite.collide_rect(self, c):
-                ding.play()
-                self.collected += 1
-                collectibles.remove(c)
-                allsprites.remove(c)
+    def collect_coin(self, touching, triggers, allsprites):
+        """Removes any coin the player is touching and adds it to the
+        collected count"""
+        for c in touching.get(triggers.COIN, ()):
+            self.events.append('coin')
+            self.collected += 1
+            triggers.remove(c)
+            allsprites.remove(c)
 
-    def collect_life(self, heartlist, allsprites, ding):
-        """Detects and removes heart if collided and collected by player"""
-        for heart in heartlist:
-            if pygame.sprite.collide_rect(self, heart):
-                ding.play()
-                self.extralives += 1
-                heartlist.remove(heart)
-                allsprites.remove(heart)      
+    def collect_life(self, touching, triggers, allsprites):
+        """Removes any heart the player is touching and gives an extra life"""
+        for heart in touching.get(triggers.HEART, ()):
+            self.events.append('heart')
+            self.extralives += 1
+            triggers.remove(heart)
+            allsprites.remove(heart)
 
-    def fall(self, fallblocks, fallsound):
-        """Detects if collides with fallblock, which then sets falldeath to
+    def fall(self, touching, triggers):
+        """Detects if touching a fallblock, which then sets falldeath to
         true"""
-        for block in fallblocks:
-            if pygame.sprite.collide_rect(self, block):
-                fallsound.play()
-                self.falldeath = True
+        for block in touching.get(triggers.FALL, ()):
+            self.events.append('fall')
+            self.falldeath = True
 
-    def exit_level(self, exitdoor):
-        """Detects if player collides with door and sets end level to true"""
-        for e in exitdoor:
-            if pygame.sprite.collide_rect(self, e):
-                self.levelcomplete = True
+    def exit_level(self, touching, triggers):
+        """Detects if player is touching the door and sets end level to true"""
+        if triggers.EXIT in touching:
+            self.levelcomplete = True
             
-class Enemyblock(Sprite):
+class Enemyblock(SharedSprite):
     """Creates enemy sprite on screen"""
     images = {}
-    def __init__(self, x, y):
+    masks = {}
+    def __init__(self, x, y, patrol=None):
         super().__init__(screen, 'MONKEY.zip', state = 'walkr')
         #http://piq.codeus.net/picture/45307/8_bit_monkey was used for the
         #initial monkey file, which i then adapted to make into an animation
         self.vx = 5
         self.rect = pygame.rect.Rect(x, y, 27, 34)
         self.x = x
-
-        self.mask = pygame.mask.from_surface(self.image)
+        #the left and right edges the enemy turns round at, worked out by
+        #the level builder from the ground under it
+        if patrol is None:
+            patrol = (x - PATROL_LEFT, x + PATROL_RIGHT)
+        self.left, self.right = patrol
         
     def update(self):
-        """Moves enemy left and right by a certain amount, changing animation
-        states as it moves"""
+        """Moves enemy left and right between the ends of its patrol,
+        changing animation states as it turns. It stops at the end rather
+        than going past it, so it never hangs off a ledge or into a wall"""
         self.rect.centerx += self.vx
-        if self.rect.left < self.x-40:
+        if self.rect.left < self.left:
+            self.rect.left = self.left
             self.vx *= -1
             self.state = 'walkr'
             self.sequence = self.images[self.state][self.direction]
             
-        if self.rect.right > self.x+110:
+        if self.rect.right > self.right:
+            self.rect.right = self.right
             self.vx *= -1
             self.state = 'walkl'
             self.sequence = self.images[self.state][self.direction]
+
+    def patrol_rect(self):
+        """Returns the area the enemy can be anywhere in while it patrols"""
+        return pygame.rect.Rect(self.left, self.rect.top, \
+                                self.right - self.left, self.rect.height)
+
+    def patrol(self, ticks):
+        """Returns (left, vx), where update called ticks times would leave
+        the enemy, without moving it. The enemy goes back and forth between
+        the same two ends, so after the first turn the rest is a whole
+        number of round trips and whatever is left over"""
+        speed = abs(self.vx)
+        lowest = self.left
+        highest = self.right - self.rect.width
+
+        def leg(left, vx):
+            #steps until update turns the enemy round and where it ends up
+            if vx > 0:
+                return (highest - left) // speed + 1, highest
+            return (left - lowest) // speed + 1, lowest
+
+        left, vx = self.rect.left, self.vx
+        steps, end = leg(left, vx)
+        if ticks < steps:
+            return left + vx * ticks, vx
+        ticks -= steps
+        left, vx = end, -vx
+        ticks %= leg(lowest, speed)[0] + leg(highest, -speed)[0]
+        steps, end = leg(left, vx)
+        if ticks < steps:
+            return left + vx * ticks, vx
+        return end - vx * (ticks - steps), -vx
+
+    def fast_forward(self, ticks):
+        """Moves the enemy on ticks steps at once, leaving it exactly as
+        calling update, check_state and animate ticks times would but in
+        the same time as calling them once. Walking left and right have the
+        same number of frames, so the frame shown doesn't depend on which
+        way the enemy was going"""
+        if ticks <= 0:
+            return
+        #animate moves on a frame each time counter runs down to 0, the
+        #image shown is that frame of the way the enemy was going then
+        if ticks >= self.counter:
+            changes = 1 + (ticks - self.counter) // self.anim_delay
+            last = self.counter + (changes - 1) * self.anim_delay
+            self.counter = self.anim_delay - \
+                           (ticks - self.counter) % self.anim_delay
+            self.frame = (self.frame + changes) % len(self.sequence)
+            state = 'walkr' if self.patrol(last)[1] > 0 else 'walkl'
+            self.image = self.images[state][self.direction][self.frame]
+        else:
+            self.counter -= ticks
+        self.rect.left, self.vx = self.patrol(ticks)
+        self.state = 'walkr' if self.vx > 0 else 'walkl'
+        self.sequence = self.images[self.state][self.direction]
             
 class Camera(object):
     """Creates camera to keep track of player in relation to screen and adds
@@ -279,6 +409,12 @@ class Camera(object):
     def update(self, target):
         self.state = self.camera_func(self.state, target.rect)
 
+    def view(self):
+        """Returns the part of the level the screen is showing, in level
+        coordinates"""
+        return pygame.rect.Rect(-self.state.left, -self.state.top, \
+                                SCREEN_WIDTH, SCREEN_HEIGHT)
+
 def camera_rect(camera, target_rect):
     l, t, _, _ = target_rect
     _, _, w, h = camera
@@ -0,0 +1,46 @@
+import collections
+
+class TextCache(object):
+    """Keeps rendered text surfaces keyed by (font, text, colour), so the
+    same words only get rasterised by the font once. Holds at most size
+    surfaces, dropping the least recently used when it is full"""
+    def __init__(self, size=256):
+        self.size = size
+        self.surfaces = collections.OrderedDict()
+
+    def render(self, font, text, colour):
+        """Returns the text drawn in font and colour, like font.render with
+        antialiasing switched on"""
+        key = (font, text, colour)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, True, colour)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+#the cache all the game's text goes through
+text = TextCache()
+
+class HUD(object):
+    """The lives, score and time left shown over the game. Each label
+    remembers the text it is showing and only fetches a new surface when
+    that text changes, which for the time is about once a second"""
+    def __init__(self, font, colour):
+        self.font = font
+        self.colour = colour
+        #label name -> (text, surface)
+        self.labels = {}
+
+    def draw(self, screen, renderer, name, string, position):
+        """Blits a label to the screen and tells the renderer about it. The
+        renderer only marks the label as changed when its text has"""
+        label = self.labels.get(name)
+        changed = label is None or label[0] != string
+        if changed:
+            label = (string, text.render(self.font, string, self.colour))
+            self.labels[name] = label
+        renderer.track(name, screen.blit(label[1], position), changed)
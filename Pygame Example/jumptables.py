@@ -0,0 +1,117 @@
+import sys
+import numpy
+import batchsim
+
+#how many frames of every arc are worked out, enough to fall further than
+#the height of any level
+FRAMES = 96
+
+#the arcs are worked out for a rect starting this far down the level. The
+#game rounds y + vy, and floats add up a little differently near 0, so an
+#arc that goes within a few tiles of the top of a level can land a pixel or
+#two away from the tables
+BASE = 1000
+
+#the ways the player leaves the ground, with its vertical speed on the first
+#frame in the air. Walking off an edge gets no gravity until the frame after,
+#a jump or a jumppad has gravity taken off straight away like PLAYER.update
+LAUNCHES = {"fall": 0.0,
+            "jump": -batchsim.JUMP_SPEED + batchsim.GRAVITY,
+            "jumppad": -batchsim.JUMPPAD_SPEED + batchsim.GRAVITY}
+
+class JumpTable(object):
+    """Where the player can be each frame after one kind of launch, worked
+    out once with the same sums as PLAYER.update. Nothing the player does in
+    the air changes how it rises and falls, so its height after t frames is
+    one number, heights[t], and it can be anywhere from WALK_SPEED * t
+    pixels left to the same right of where it started. Offsets are in pixels
+    from the player's rect when it left the ground, with down positive.
+    Platforms in the way are not known about, the tables say where the arc
+    goes in open air"""
+    def __init__(self, launch, frames=FRAMES):
+        self.launch = launch
+        speeds = numpy.zeros(frames + 1)
+        heights = numpy.zeros(frames + 1, dtype=numpy.int64)
+        speed = LAUNCHES[launch]
+        for t in range(1, frames + 1):
+            speeds[t] = speed
+            #the rect only holds whole pixels, so the height is rounded
+            #every frame as the game does
+            heights[t] = batchsim.pygame_round(BASE + heights[t - 1] \
+                                               + speed) - BASE
+            speed = min(speed + batchsim.GRAVITY, batchsim.MAX_FALL)
+        self.speeds = speeds
+        self.heights = heights
+        self.reach = batchsim.WALK_SPEED * numpy.arange(frames + 1)
+        #landings[h - highest] is the frame the player lands on ground h
+        #pixels below where it left the ground, or -1 if the arc never comes
+        #down onto it. It lands on the first frame falling that takes it
+        #past h
+        self.highest = int(heights.min())
+        self.landings = numpy.full(int(heights.max()) - self.highest + 1, -1)
+        for t in range(1, frames + 1):
+            if speeds[t] > 0:
+                self.landings[heights[t - 1] - self.highest: \
+                              heights[t] - self.highest] = t
+
+    def offsets(self, frames):
+        """Returns an (n, 2) array of every (dx, dy) the player can be at
+        exactly frames frames after the launch"""
+        steps = numpy.arange(-frames, frames + 1) * batchsim.WALK_SPEED
+        return numpy.stack([steps, numpy.full(len(steps), \
+                            self.heights[frames])], axis=1)
+
+    def landing_frame(self, dy):
+        """Returns the frames in the air before landing on ground dy pixels
+        below where the player left the ground (negative is above), -1 where
+        the arc never lands there. dy can be a number or an array"""
+        dy = numpy.asarray(dy)
+        index = dy - self.highest
+        inside = (index >= 0) & (index < len(self.landings))
+        return numpy.where(inside, \
+            self.landings[numpy.clip(index, 0, len(self.landings) - 1)], -1)
+
+    def can_land(self, dx, dy):
+        """True where the player can land on ground dx pixels across and dy
+        pixels down from where it left the ground, if nothing is in the way"""
+        frames = self.landing_frame(dy)
+        return (frames >= 0) & \
+               (numpy.abs(dx) <= self.reach[numpy.maximum(frames, 0)])
+
+    def rise(self):
+        """Returns the most pixels the arc goes up"""
+        return -self.highest
+
+#one table for each launch, for looking up rather than making again
+FALL = JumpTable("fall")
+JUMP = JumpTable("jump")
+JUMPPAD = JumpTable("jumppad")
+TABLES = {"fall": FALL, "jump": JUMP, "jumppad": JUMPPAD}
+
+def can_reach(launch, start, end):
+    """True if the player standing on tile start, as (column, row), can land
+    on top of tile end with the given launch, if nothing is in the way.
+    Standing on a tile means the player's rect overlaps its column, so the
+    player can be up to a rect and a tile, less a pixel each, either side"""
+    table = TABLES[launch]
+    across = abs(end[0] - start[0]) * batchsim.TILE
+    slack = batchsim.PLAYER_SIZE + batchsim.TILE - 2
+    dy = (end[1] - start[1]) * batchsim.TILE
+    return bool(table.can_land(max(0, across - slack), dy))
+
+def main(args):
+    """Prints how high each launch goes and how far across it can get
+    landing on ground some tiles above or below"""
+    tiles = range(-8, 9)
+    print("tiles down " + " ".join("{0:>4}".format(n) for n in tiles))
+    for launch in sorted(TABLES):
+        table = TABLES[launch]
+        frames = table.landing_frame(numpy.array(tiles) * batchsim.TILE)
+        across = [table.reach[t] // batchsim.TILE if t >= 0 else "-" \
+                  for t in frames.tolist()]
+        print("{0:<10} ".format(launch) + \
+              " ".join("{0:>4}".format(n) for n in across))
+        print("    rises {0} pixels".format(table.rise()))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
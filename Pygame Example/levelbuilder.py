@@ -0,0 +1,233 @@
+import assets
+import gameclasses
+import groundblocks
+import renderer
+import specialblocks
+import spatialgrid
+import triggers
+
+def merge_tiles(level, letter):
+    """Finds every tile of one letter in the level and joins touching tiles
+    into as few rectangles as it can. Runs of tiles along a row are joined
+    first, then a run is stretched down over the rows below for as long as
+    the row below has a run starting and ending in the same columns.
+    Returns (x, y, width, height) tuples in pixels"""
+    rects = []
+    #runs from the row above that can still be stretched down, keyed by
+    #their (first column, last column)
+    open_runs = {}
+    for rownumber, row in enumerate(level):
+        runs = {}
+        col = 0
+        while col < len(row):
+            if row[col] != letter:
+                col += 1
+                continue
+            start = col
+            while col < len(row) and row[col] == letter:
+                col += 1
+            key = (start, col)
+            if key in open_runs:
+                #same columns as a run above, so make that rectangle taller
+                rect = open_runs[key]
+                rect[3] += 1
+            else:
+                rect = [start, rownumber, col - start, 1]
+                rects.append(rect)
+            runs[key] = rect
+        open_runs = runs
+    return [(x*32, y*32, w*32, h*32) for x, y, w, h in rects]
+
+def patrol_bounds(level, column, row):
+    """Works out how far an enemy starting on the tile at column, row can
+    walk: along the platform tiles under it, until they run out or a
+    platform in its way blocks it. Enemies don't fall, so some levels have
+    them a tile above the ground, and the ground is the first platform in
+    the two rows below. The enemy is taller than a tile, so the tiles it
+    walks through are in its own row and the one above. Returns the (left,
+    right) edges in pixels, or None if there is no ground under it"""
+    below = [r for r in (row + 1, row + 2) \
+             if r < len(level) and level[r][column] == "P"]
+    if not below:
+        return None
+    ground = below[0]
+
+    def walkable(col):
+        return 0 <= col < len(level[row]) and level[ground][col] == "P" \
+               and all(level[r][col] != "P" \
+                       for r in range(max(row - 1, 0), ground))
+
+    left = right = column
+    while walkable(left - 1):
+        left -= 1
+    while walkable(right + 1):
+        right += 1
+    return left * 32, (right + 1) * 32
+
+class CompiledLevel(object):
+    """Turns a level's list of strings into its sprites once. The static
+    blocks are kept and reused every time the level restarts, only the
+    coins, hearts and enemies need resetting"""
+    def __init__(self, level):
+        self.level = level
+        #create total level width and height variables
+        self.width = len(level[0])*32
+        self.height = len(level)*32
+
+        self.platforms = []
+        self.fallblocks = []
+        self.jumppads = []
+        self.exitdoor = []
+        self.collectibles = []
+        self.heartlist = []
+        #enemies move about, so only where they start is kept and new ones
+        #are made on every restart
+        self.enemyspawns = []
+        #coins and hearts, which get drawn each frame until collected, in
+        #the order they appear in the level
+        self.sprites = []
+        #backgrounds and doors never move or go away, so they are drawn
+        #once onto the level's static layer. Backgrounds are only kept as
+        #(class, x, y) and made when the layer is baked, so a level that is
+        #never drawn never loads its background image
+        self.backgrounds = []
+        self.static = []
+        self._staticlayer = None
+
+        #build the level, looping over columns and rows, if 'letter' appears
+        #then append to the specified list and add to sprite list for drawing
+        #to the screen later. Then move on one character, until you hit the
+        #end of a row, then move onto the next row. This is done by adding 32
+        #to the x and y variables within the loops
+        x = y = 0
+        for row in level:
+            for col in row:
+                ###ALL THE SPRITES USED IN THE LEVEL BUILDING ARE FOUND IN
+                ###gameclasses.py, specialblocks.py and groundblocks.py
+
+                #depending on the level, create the background in the top left
+                #corner, add them first to be drawn below everything else
+                if col == "1":
+                    self.backgrounds.append((groundblocks.BACK1, x, y))
+                if col == "2":
+                    self.backgrounds.append((groundblocks.BACK2, x, y))
+                if col == "3":
+                    self.backgrounds.append((groundblocks.BACK3, x, y))
+
+                #create coins that detect a player collision for them to be
+                #collected. These are added to allsprites to be drawn to the
+                #screen
+                if col == "C":
+                    p = specialblocks.Collectible(x+4, y+4)
+                    self.collectibles.append(p)
+                    self.sprites.append(p)
+                #heart has similar aspects to the collectible sprite but when
+                #collected gives an extra life instead of extra score
+                if col == "H":
+                    p = specialblocks.Heart(x+4, y+4)
+                    self.heartlist.append(p)
+                    self.sprites.append(p)
+                #jumppad acts as a spring for the player to reach higher
+                #places. This acts when a player collision is detected with
+                #the top of this object
+                if col == "J":
+                    p = specialblocks.Jumppad(x, y)
+                    self.jumppads.append(p)
+                #Exit door detects player collision and then activates level
+                #complete variables
+                if col == "X":
+                    p = specialblocks.Exit_door(x, y)
+                    self.exitdoor.append(p)
+                    self.static.append(p)
+                #Enemies are moving sprites that will only die if the bottom
+                #of the player collides with the top of the enemy
+                if col == "E":
+                    self.enemyspawns.append((x, y-13, \
+                                             self.patrol(x//32, y//32)))
+
+                x += 32
+            y += 32
+            x = 0
+
+        #create platforms - will detect player collision on all sides.
+        #Touching platform tiles are joined into bigger rectangles so the
+        #player has far fewer of them to check. Since the background contains
+        #the platform art, these platforms will not be drawn in allsprites.
+        for x, y, width, height in merge_tiles(level, "P"):
+            p = groundblocks.Platform(x, y, width, height)
+            self.platforms.append(p)
+
+        #create blocks that detect when the player hits the top of them
+        #these are placed at the bottom of levels to detect when a player has
+        #fallen. They are joined up the same way as the platforms
+        for x, y, width, height in merge_tiles(level, "F"):
+            p = specialblocks.Fallblock(x, y, width, height)
+            self.fallblocks.append(p)
+
+        #put the platforms into a grid of tile sized cells, so the player
+        #only checks the platforms in the cells it overlaps each frame
+        self.platformgrid = spatialgrid.SpatialGrid(32)
+        for p in self.platforms:
+            self.platformgrid.add(p)
+
+        #put the coins and hearts into a grid as well, so drawing only has to
+        #look at the cells the camera can see. Hearts have a smaller rect than
+        #their image, so the grid uses the image size
+        self.drawgrid = spatialgrid.SpatialGrid(128)
+        for p in self.sprites:
+            self.drawgrid.add(p, p.image.get_rect(topleft=p.rect.topleft))
+
+        #everything the player can touch but not stand on goes into one
+        #trigger layer, so one check each frame finds all of them
+        self.triggers = triggers.TriggerLayer()
+        for p in self.fallblocks:
+            self.triggers.add(self.triggers.FALL, p)
+        for p in self.collectibles:
+            self.triggers.add(self.triggers.COIN, p)
+        for p in self.heartlist:
+            self.triggers.add(self.triggers.HEART, p)
+        for p in self.exitdoor:
+            self.triggers.add(self.triggers.EXIT, p)
+        for p in self.jumppads:
+            self.triggers.add(self.triggers.JUMPPAD, p)
+
+    @property
+    def staticlayer(self):
+        """The backgrounds and doors baked into one layer, so a frame only
+        needs a blit or two to draw them. It is baked the first time it is
+        drawn, so a level that is only simulated, e.g. headless, never pays
+        for it or needs the background images"""
+        if self._staticlayer is None:
+            #backgrounds first so they are drawn below the doors
+            backgrounds = [background(x, y) \
+                           for background, x, y in self.backgrounds]
+            self._staticlayer = renderer.StaticLayer( \
+                backgrounds + self.static, self.width, self.height)
+        return self._staticlayer
+
+    def release_art(self):
+        """Drops the baked static layer and the background images, e.g.
+        when the game moves on to another level. The rest of the level is
+        kept, and the layer is baked again if the level is drawn again"""
+        self._staticlayer = None
+        for background in set(b for b, x, y in self.backgrounds):
+            assets.images.discard(background.filename)
+
+    def patrol(self, column, row):
+        """The ends of the patrol for an enemy starting on the tile at
+        column, row. It walks its usual distance either way, cut short where
+        the platform under it ends or something is in the way, so the
+        enemy never needs to look at the level while it moves"""
+        x = column*32
+        left = x - gameclasses.PATROL_LEFT
+        right = x + gameclasses.PATROL_RIGHT
+        ground = patrol_bounds(self.level, column, row)
+        if ground is not None:
+            left = max(left, ground[0])
+            right = min(right, ground[1])
+        return left, right
+
+    def spawn_enemies(self):
+        """Creates a new set of enemies at their starting positions"""
+        return [gameclasses.Enemyblock(x, y, patrol) \
+                for x, y, patrol in self.enemyspawns]
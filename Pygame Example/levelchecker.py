@@ -0,0 +1,272 @@
+import multiprocessing
+import os
+import sys
+import time
+import numpy
+import batchsim
+import controls
+import levels
+
+#the controls worth trying each step. On the ground the player can walk,
+#jump or stand still, in the air jumping does nothing so only walking is
+#tried. Holding left and right together is the same as right
+GROUND_ACTIONS = numpy.array([0, controls.LEFT, controls.RIGHT, \
+                              controls.JUMP, controls.LEFT | controls.JUMP, \
+                              controls.RIGHT | controls.JUMP])
+AIR_ACTIONS = numpy.array([0, controls.LEFT, controls.RIGHT])
+
+#the tiles the checker looks for, with the rect each one's sprite has
+#relative to its tile: coins and hearts are smaller than a tile and the
+#exit door is two tiles tall
+ITEMS = {"X": (0, 0, 32, 64), "C": (4, 4, 24, 24), "H": (4, 4, 24, 24)}
+
+#how many chunks of seeds each process gets a round, and the fewest seeds
+#worth sending as a chunk
+CHUNKS_PER_PROCESS = 4
+SMALLEST_CHUNK = 32
+
+def find_items(level):
+    """Returns (letter, column, row) for every exit door, coin and heart in
+    the level, and an array of their rects in pixels"""
+    items = []
+    rects = []
+    for row, line in enumerate(level):
+        for column, letter in enumerate(line):
+            if letter in ITEMS:
+                x, y, w, h = ITEMS[letter]
+                items.append((letter, column, row))
+                rects.append((column * 32 + x, row * 32 + y, w, h))
+    return items, numpy.array(rects, dtype=numpy.int64).reshape(-1, 4)
+
+class Explorer(object):
+    """Explores where the player can get to from some starting states,
+    following every combination of controls until the player lands on the
+    ground. A state is the player's rect position, vertical speed and
+    whether it is on the ground, everything else PLAYER.update does is
+    decided by those and the controls. States already seen are memoised so
+    paths that meet up are only followed once"""
+    def __init__(self, level):
+        self.level = level
+        self.batch = batchsim.Batch(level, 0, (0, 0))
+        self.items, self.rects = find_items(level)
+        self.width = len(level[0]) * 32
+        self.height = len(level) * 32
+        #each different vertical speed gets a number for packing states
+        self.speeds = []
+        self.speedids = {}
+
+    def pack(self, x, y, vy, onground):
+        """Packs states into one number each, so they can be memoised in a
+        set of ints. The states must be inside the level, or above it by no
+        more than its height"""
+        speeds, which = numpy.unique(vy, return_inverse=True)
+        ids = numpy.array([self.speedids.setdefault(speed, len(self.speedids)) \
+                           for speed in speeds.tolist()], dtype=numpy.int64)
+        self.speeds = list(self.speedids)
+        keys = ids[which] * 2 + onground
+        keys = keys * (2 * self.height) + y + self.height
+        return keys * (self.width + batchsim.PLAYER_SIZE) + x + \
+               batchsim.PLAYER_SIZE
+
+    def unpack(self, keys):
+        """Turns numbers made by pack back into (x, y, vy, onground)"""
+        keys, x = numpy.divmod(keys, self.width + batchsim.PLAYER_SIZE)
+        keys, y = numpy.divmod(keys, 2 * self.height)
+        ids, onground = numpy.divmod(keys, 2)
+        vy = numpy.array(self.speeds)[ids]
+        return x - batchsim.PLAYER_SIZE, y - self.height, vy, onground == 1
+
+    def explore(self, x, y, vy, onground):
+        """Follows every path from the given states until it lands, dies or
+        leaves the level. Returns (x, y, vy) arrays of the states it landed
+        in, which were not explored further, and the indexes into items of
+        the ones it touched"""
+        batch = self.batch
+        seen = set()
+        landings = []
+        touched = numpy.zeros(len(self.items), dtype=bool)
+        while len(x):
+            #the player dies touching a fallblock, and a player that has
+            #left the level by a gap in its edge never comes back
+            alive = ~batch.fall.touching(x, y) & (y < self.height) \
+                    & (y > -self.height) & (x < self.width) \
+                    & (x > -batchsim.PLAYER_SIZE)
+            x, y, vy, onground = x[alive], y[alive], vy[alive], onground[alive]
+            #memoise, dropping states seen before, including ones repeated
+            #in this frontier
+            new = set(self.pack(x, y, vy, onground).tolist())
+            new.difference_update(seen)
+            if not new:
+                break
+            seen.update(new)
+            x, y, vy, onground = self.unpack(numpy.fromiter(new, \
+                                             numpy.int64, len(new)))
+            touched |= self.touching_items(x, y)
+            #try every action from every state, ones on the ground get more
+            counts = numpy.where(onground, len(GROUND_ACTIONS), \
+                                 len(AIR_ACTIONS))
+            state = numpy.repeat(numpy.arange(len(x)), counts)
+            which = numpy.arange(len(state)) - \
+                    numpy.repeat(numpy.cumsum(counts) - counts, counts)
+            actions = numpy.where(onground[state], \
+                GROUND_ACTIONS[numpy.minimum(which, len(GROUND_ACTIONS) - 1)], \
+                AIR_ACTIONS[numpy.minimum(which, len(AIR_ACTIONS) - 1)])
+            batch.place(x[state], y[state], vy[state], onground[state])
+            batch.step(actions)
+            #a player that went through the door has finished, and was
+            #already counted as touching it
+            playing = ~batch.complete
+            landed = playing & batch.onground
+            landings.append((batch.x[landed], batch.y[landed], \
+                             batch.vy[landed]))
+            flying = playing & ~batch.onground
+            x, y = batch.x[flying], batch.y[flying]
+            vy, onground = batch.vy[flying], batch.onground[flying]
+        if landings:
+            x, y, vy = [numpy.concatenate(part) for part in zip(*landings)]
+        else:
+            x = y = numpy.zeros(0, dtype=numpy.int64)
+            vy = numpy.zeros(0)
+        return (x, y, vy), numpy.flatnonzero(touched)
+
+    def touching_items(self, x, y):
+        """Returns which items any of the players' rects overlap"""
+        ix, iy, iw, ih = self.rects.T
+        size = batchsim.PLAYER_SIZE
+        overlap = (x[:, None] < ix + iw) & (x[:, None] + size > ix) & \
+                  (y[:, None] < iy + ih) & (y[:, None] + size > iy)
+        return overlap.any(axis=0)
+
+#each worker process keeps its own Explorer for the level being checked
+_explorer = None
+
+def _start_worker(level):
+    global _explorer
+    _explorer = Explorer(level)
+
+def _explore(seeds):
+    x, y, vy = seeds
+    return _explorer.explore(x, y, vy, numpy.ones(len(x), dtype=bool))
+
+def chunks(seeds, count):
+    """Splits (x, y, vy) arrays of seeds into up to count chunks"""
+    x, y, vy = seeds
+    count = max(1, min(count, len(x) // SMALLEST_CHUNK))
+    return list(zip(numpy.array_split(x, count), numpy.array_split(y, count), \
+                    numpy.array_split(vy, count)))
+
+def check(level, start, processes=None):
+    """Works out which exit doors, coins and hearts in the level the player
+    can reach from start, the centre of the player's rect when the level
+    begins. Enemies are left out, so anything behind one counts as
+    reachable.
+
+    Every place the player lands is a seed: the seeds are shared out between
+    a pool of processes, which each follow every jump and walk from theirs
+    until they land again. The landings are memoised here so no seed is
+    explored twice, and the new ones are the seeds for the next round.
+    Returns a dictionary of (letter, column, row) -> True if it can be
+    reached"""
+    if processes is None:
+        processes = os.cpu_count() or 1
+    explorer = Explorer(level)
+    reached = numpy.zeros(len(explorer.items), dtype=bool)
+    #the player starts in the air, so explore from there first
+    size = batchsim.PLAYER_SIZE
+    x = numpy.array([start[0] - size // 2], dtype=numpy.int64)
+    y = numpy.array([start[1] - size // 2], dtype=numpy.int64)
+    seeds, touched = explorer.explore(x, y, numpy.zeros(1), \
+                                      numpy.zeros(1, dtype=bool))
+    reached[touched] = True
+    pool = None
+    if processes > 1:
+        pool = multiprocessing.Pool(processes, _start_worker, (level,))
+    else:
+        _start_worker(level)
+    landed = set()
+    try:
+        while True:
+            #keep only landings that have never been explored
+            x, y, vy = seeds
+            keep = numpy.zeros(len(x), dtype=bool)
+            for i, key in enumerate(zip(x.tolist(), y.tolist(), vy.tolist())):
+                if key not in landed:
+                    landed.add(key)
+                    keep[i] = True
+            if not keep.any():
+                break
+            work = chunks((x[keep], y[keep], vy[keep]), \
+                          processes * CHUNKS_PER_PROCESS)
+            if pool is None:
+                results = map(_explore, work)
+            else:
+                results = pool.imap_unordered(_explore, work)
+            found = []
+            for landings, touched in results:
+                found.append(landings)
+                reached[touched] = True
+            seeds = [numpy.concatenate(part) for part in zip(*found)]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return dict(zip(explorer.items, reached.tolist()))
+
+def load_level(filename):
+    """Reads a level written as its rows of tiles, one per line, like the
+    strings in levels.py. Blank lines are skipped"""
+    f = open(filename, "r")
+    level = [line.rstrip("\n") for line in f if line.strip()]
+    f.close()
+    #every row has to be as wide as the first for the tile grids
+    width = len(level[0])
+    return [row.ljust(width) for row in level]
+
+def report(name, results):
+    """Prints what can and can't be reached, returns True if the exit door
+    can be reached"""
+    names = {"X": "exit door", "C": "coin", "H": "heart"}
+    counts = []
+    for letter in "XCH":
+        total = [item for item in results if item[0] == letter]
+        got = [item for item in total if results[item]]
+        counts.append("{0}/{1} {2}s".format(len(got), len(total), \
+                                           names[letter]))
+    print("{0}: {1} reachable".format(name, ", ".join(counts)))
+    for letter, column, row in sorted(results, key=lambda item: item[1:]):
+        if not results[(letter, column, row)]:
+            print("    can't reach {0} at column {1}, row {2}".format( \
+                  names[letter], column, row))
+    return any(results[item] for item in results if item[0] == "X")
+
+def main(args):
+    """Checks the levels given as level numbers or level files, or all the
+    game's levels if none are given. Files start from level 1's start
+    unless one is given as --start=x,y. Exits with 1 if any level's exit
+    door can't be reached"""
+    start = None
+    names = []
+    for arg in args:
+        if arg.startswith("--start="):
+            start = tuple(int(n) for n in arg[len("--start="):].split(","))
+        else:
+            names.append(arg)
+    if not names:
+        names = [str(number) for number in sorted(levels.LEVELS)]
+    ok = True
+    for name in names:
+        if name.isdigit():
+            level = levels.LEVELS[int(name)]
+            levelstart = start or levels.STARTS[int(name)]
+            name = "level " + name
+        else:
+            level = load_level(name)
+            levelstart = start or levels.STARTS[1]
+        began = time.perf_counter()
+        results = check(level, levelstart)
+        ok = report(name, results) and ok
+        print("    checked in {0:.1f}s".format(time.perf_counter() - began))
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
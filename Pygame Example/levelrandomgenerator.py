@@ -0,0 +1,197 @@
+import multiprocessing
+import os
+import random
+import sys
+import time
+import batchsim
+import jumptables
+import levelchecker
+import levels
+
+#the size of the levels made, in tiles
+WIDTH = 100
+HEIGHT = 24
+
+#every level starts with the player dropping onto the same ledge, in the same
+#place as level 1, so levelchecker checks level files from the right start
+START = levels.STARTS[1]
+START_ROW = 19
+START_LENGTH = 8
+
+#how far the ground can step up without a jumppad, as far as a jump rises,
+#and how far it can drop. A jumppad rises nearly nine tiles but the player
+#has to get across onto the wall as well, so those walls are kept lower
+MAX_STEP_UP = jumptables.JUMP.rise() // batchsim.TILE
+MAX_PAD_STEP = 6
+MAX_DROP = 4
+#the highest and lowest rows the top of the ground can be on, and the length
+#of the stretch of ground the door is on
+TOP_ROW = 9
+BOTTOM_ROW = HEIGHT - 3
+LAST_LENGTH = 8
+
+#how many levels each worker process is given to make and check at a time
+CANDIDATES_PER_PROCESS = 8
+
+def generate(seed, width=WIDTH):
+    """Makes a level from seed as a list of row strings, using the same
+    letters as levels.py. The same seed always makes the same level. The
+    level is built from left to right out of stretches of ground at
+    different heights with pits between them, floating platforms, coins,
+    enemies and jumppads, with the exit door at the far end. Nothing here
+    makes sure the level can be finished, that's done by check_level"""
+    rand = random.Random(seed)
+    grid = [[" "] * width for row in range(HEIGHT)]
+    for column in range(width):
+        grid[0][column] = "P"
+    for row in range(HEIGHT):
+        grid[row][0] = grid[row][width - 1] = "P"
+    grid[1][1] = rand.choice("123")
+
+    def ground(first, length, top):
+        #solid from the top of the ground down to the bottom of the level
+        for column in range(first, first + length):
+            for row in range(top, HEIGHT):
+                grid[row][column] = "P"
+
+    ground(1, START_LENGTH, START_ROW)
+    column = 1 + START_LENGTH
+    top = START_ROW
+    #whether the last thing made was a pit, two pits together are too far
+    #to jump and a jumppad needs ground in front of its wall
+    pit = False
+    #leave room at the end for the last stretch of ground and the door
+    while column < width - LAST_LENGTH - 4:
+        if not pit and rand.random() < 0.25:
+            #a pit with fallblocks at the bottom, sometimes with a platform
+            #to jump across on
+            length = rand.randint(2, 5)
+            for x in range(column, column + length):
+                grid[HEIGHT - 1][x] = "F"
+            if length >= 4:
+                row = top - rand.randint(0, 2)
+                for x in range(column + 1, column + length - 1):
+                    grid[row][x] = "P"
+            column += length
+            pit = True
+            continue
+        length = min(rand.randint(4, 10), width - LAST_LENGTH - column)
+        step = rand.randint(-MAX_STEP_UP, MAX_DROP)
+        if not pit and rand.random() < 0.15:
+            #a wall too high to jump, with a jumppad in front of it. The
+            #player only bounces off a pad it stands within 30 pixels of, so
+            #the pad is two tiles back from the wall
+            step = -rand.randint(MAX_STEP_UP + 1, MAX_PAD_STEP)
+        newtop = min(max(top + step, TOP_ROW), BOTTOM_ROW)
+        if top - newtop > MAX_STEP_UP:
+            grid[top][column - 3] = "J"
+        top = newtop
+        pit = False
+        ground(column, length, top)
+        #a platform to jump onto with a coin or, rarely, a heart on it. The
+        #player can't get on anything higher than a jump or fit under
+        #anything lower, so it is a step up from the ground that starts far
+        #enough in to be jumped onto from this stretch, and ends far enough
+        #from the end that a jumppad can go there with nothing above it
+        first = column + rand.randint(2, max(2, length // 2))
+        last = min(first + rand.randint(2, 4), column + length - 3)
+        if last - first >= 2 and rand.random() < 0.3:
+            for x in range(first, last):
+                grid[top - 2][x] = "P"
+            grid[top - 3][first] = "H" if rand.random() < 0.1 else "C"
+        #coins on the ground and enemies on the longer stretches, but not
+        #under the platform where nothing fits
+        for x in range(column, column + length):
+            if grid[top - 2][x] == " " and rand.random() < 0.2:
+                grid[top - 1][x] = "C"
+        x = column + rand.randint(1, length - 2)
+        if length >= 6 and grid[top - 2][x] == " " and rand.random() < 0.5:
+            grid[top - 1][x] = "E"
+        column += length
+    #the last stretch of ground runs to the right wall, the door stands on it
+    newtop = min(max(top + rand.randint(-MAX_STEP_UP, MAX_DROP), TOP_ROW), \
+                 BOTTOM_ROW)
+    ground(column, width - 1 - column, newtop)
+    grid[newtop - 2][width - 4] = "X"
+    return ["".join(row) for row in grid]
+
+def check_level(seed):
+    """Makes the level for seed and checks it with levelchecker. Returns
+    (seed, level) if the exit door can be reached, with any coins and hearts
+    that can't be reached taken out, or (seed, None) if it can't"""
+    level = generate(seed)
+    results = levelchecker.check(level, START, processes=1)
+    if not any(results[item] for item in results if item[0] == "X"):
+        return seed, None
+    rows = [list(row) for row in level]
+    for (letter, column, row), reached in results.items():
+        if not reached:
+            rows[row][column] = " "
+    return seed, ["".join(row) for row in rows]
+
+def generate_levels(count, seed=0, processes=None):
+    """Yields (seed, level) for count levels that can be finished, made from
+    seed, seed + 1 and so on, skipping seeds whose level can't be. The
+    levels are made and checked in batches shared out between a pool of
+    processes, and come back in seed order so the same seed and count always
+    give the same levels however many processes there are"""
+    if processes is None:
+        processes = os.cpu_count() or 1
+    pool = None
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+    batch = processes * CANDIDATES_PER_PROCESS
+    made = 0
+    try:
+        while made < count:
+            seeds = range(seed, seed + batch)
+            seed += batch
+            if pool is None:
+                results = map(check_level, seeds)
+            else:
+                results = pool.imap(check_level, seeds)
+            for levelseed, level in results:
+                if level is not None and made < count:
+                    made += 1
+                    yield levelseed, level
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+def save_level(filename, level):
+    """Writes a level one row per line, the way levelchecker.load_level
+    reads it"""
+    f = open(filename, "w")
+    f.write("\n".join(level) + "\n")
+    f.close()
+
+def main(args):
+    """Makes levels and saves them in a folder, e.g.
+        python levelrandomgenerator.py 1000 --seed=0 --out=generated
+    makes generated/level0001.txt up to level1000.txt"""
+    count = 10
+    seed = 0
+    folder = "generated"
+    for arg in args:
+        if arg.startswith("--seed="):
+            seed = int(arg[len("--seed="):])
+        elif arg.startswith("--out="):
+            folder = arg[len("--out="):]
+        else:
+            count = int(arg)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    began = time.perf_counter()
+    tried = seed
+    for number, (levelseed, level) in \
+            enumerate(generate_levels(count, seed), 1):
+        save_level(os.path.join(folder, "level{0:04d}.txt".format(number)), \
+                   level)
+        tried = levelseed + 1
+    taken = time.perf_counter() - began
+    print("made {0} levels from {1} seeds in {2:.1f}s, {3:.2f}s a level".format( \
+          count, tried - seed, taken, taken / max(count, 1)))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+#the levels, one string per row of 32 pixel tiles:
+#   P platform, F fall block, J jumppad, C coin, H heart, E enemy,
+#   X exit door, and 1, 2 or 3 for the level's background in the top left
+LEVELS = {}
+
+LEVELS[1] = [
+    "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP",
+    "P1                                                                   P",
+    "P                                                                    P",
+    "P                                                                    P",
+    "P                                                                    P",
+    "P                                                                    P",
+    "P                                                                    P",
+    "P                                                              X     P",
+    "P               PP                                                   P",
+    "P       CE           C                                      PPPPPPP  P",
+    "P      PPPPPP        PP                        C  EC  C              P",
+    "P                                            PPPPPPPPPPP             P",
+    "P                          PP                                        P",
+    "P                                      PPP                           P",
+    "P                               PPPP                                 P",
+    "P                               P  P                                 P",
+    "P                      PJPPPPP  P  P                                 P",
+    "P                  PP           P  P                                 P",
+    "P           E                   P  P   C              C              P",
+    "PPPPPPPPPPPPPPPPP               P   JPPPPPPPPPPPPPPPPPPPPJPPPP       P",
+    "P               P               P                            P       P",
+    "P               P               P                            P       P",
+    "P               P               P                            P       P",
+    "                 FFFFFFFFFFFFFFF           FFFFFFF            FFFFFFFP"]
+
+LEVELS[2] = [
+    "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP",
+    "P2                                                                     P",
+    "P                                                                      P",
+    "P                                                                      P",
+    "P                                                                      P",
+    "P                                            C    C                    P",
+    "P                                      C               C               P",
+    "P                                      E       E       E               P",
+    "P                                 PPPPPPPPPPPPPPPPPPPPPPPPPPPP         P",
+    "P                             C                                        P",
+    "P                            PP                                  E     P",
+    "P                                 CC                            PPPPP  P",
+    "P                                 PP                                   P",
+    "P                       C                CH                 P C        P",
+    "P                      PPJ                                   PPP       P",
+    "P                                    C        C                        P",
+    "P                 PPP                    E           E           E     P",
+    "P                       C            C        C                 PPPPP  P",
+    "P                      PPP                                             P",
+    "P                                    C        C             P C        P",
+    "P                 PPP                J        J              PPP       P",
+    "P                                                                      P",
+    "PPPPPPPPPPPPPPPPPPP                                               X    P",
+    "Pgggggggggggggggggg                                                    P",
+    "Pgggggggggggggggggg                                            PPPPPPPPP",
+    "Pgggggggggggggggggg                                            P       P",
+    "                   FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFP"]
+
+LEVELS[3] = [
+    "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP",
+    "P3                                                                                                                           P",
+    "P                                                                                                                            P",
+    "P                                                                                                                            P",
+    "P                                                                                                                            P",
+    "P                                                                                                                            P",
+    "P                                                                                       PPPPPPPPPPP                          P",
+    "P                                                                                     PP           PPP                       P",
+    "P                                                                                   PP                PP                     P",
+    "PPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPPP    C               PPPPPPPPPPPPPPPPPPPPPP",
+    "P                                                                                    C                                       P",
+    "P                                                                                        E   C  E  C                         P",
+    "P                          C                                                          PPPPPPPPPPPPPPPP      C                P",
+    "P                     C                      P C                      CC           C                    PPP      C           P",
+    "P                          P     C  E  C    PP    C                C      C                                   PP      X      P",
+    "P      C              P                    P P   PP              PPPP    PPPP                                                P",
+    "PPPPPPPPPPPP    PPP          PPPPPPPPPPPPPP P       PPPPPPPPPP                 PPPJ                             PPPPPPPPPPPPPP",
+    "P          P    PPP          P             P        P        P                 PPPP                             P            P",
+    "P          P                 P            P         P        P                                                  P            P",
+    "P          P                 P           P          P        P                                                  P            P",
+    "P          P                 P           P          P        PH                                                 P            P",
+    "P           FFFFFFFFFFFFFFFFF             FFFFFFFFFF          JFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF             P"]
+
+#where the centre of the player starts on each level
+STARTS = {1: (100, 550),
+          2: (100, 580),
+          3: (112, 470)}
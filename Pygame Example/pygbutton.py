@@ -47,6 +47,11 @@ DARKGRAY  = ( 64,  64,  64)
 GRAY      = (128, 128, 128)
 LIGHTGRAY = (212, 208, 200)
 
+# Text buttons that look the same share the same three surfaces. Keyed by
+# (size, caption, bgcolor, fgcolor, font), the values are
+# (normal, down, highlight) surfaces. They are shared, so never draw on them.
+_skins = {}
+
 class PygButton(object):
     def __init__(self, rect=None, caption='', bgcolor=LIGHTGRAY, fgcolor=BLACK, font=None, normal=None, down=None, highlight=None):
         """Create a new button object. Parameters:
@@ -97,11 +102,8 @@ class PygButton(object):
         self.customSurfaces = False # button starts as a text button instead of having custom images for each surface
 
         if normal is None:
-            # create the surfaces for a text button
-            self.surfaceNormal = pygame.Surface(self._rect.size)
-            self.surfaceDown = pygame.Surface(self._rect.size)
-            self.surfaceHighlight = pygame.Surface(self._rect.size)
-            self._update() # draw the initial button images
+            # get the surfaces for a text button
+            self._update()
         else:
             # create the surfaces for a custom image button
             self.setSurfaces(normal, down, highlight)
@@ -182,12 +184,16 @@ class PygButton(object):
     def draw(self, surfaceObj):
         """Blit the current button's appearance to the surface object."""
         if self._visible:
-            if self.buttonDown:
-                surfaceObj.blit(self.surfaceDown, self._rect)
-            elif self.mouseOverButton:
-                surfaceObj.blit(self.surfaceHighlight, self._rect)
-            else:
-                surfaceObj.blit(self.surfaceNormal, self._rect)
+            surfaceObj.blit(self._currentSurface(), self._rect)
+
+
+    def _currentSurface(self):
+        """Return the surface for the button's current appearance."""
+        if self.buttonDown:
+            return self.surfaceDown
+        elif self.mouseOverButton:
+            return self.surfaceHighlight
+        return self.surfaceNormal
 
 
     def _update(self):
@@ -198,13 +204,23 @@ class PygButton(object):
             self.surfaceHighlight = pygame.transform.smoothscale(self.origSurfaceHighlight, self._rect.size)
             return
 
+        # reuse the surfaces of an identical button if one has been made
+        key = (self._rect.size, self._caption, self.bgcolor, self._fgcolor, self._font)
+        if key not in _skins:
+            _skins[key] = self._drawSkin()
+        self.surfaceNormal, self.surfaceDown, self.surfaceHighlight = _skins[key]
+
+
+    def _drawSkin(self):
+        """Draw and return new (normal, down, highlight) surfaces for a text button."""
         w = self._rect.width # syntactic sugar
         h = self._rect.height # syntactic sugar
+        self.surfaceNormal = pygame.Surface(self._rect.size)
+        self.surfaceDown = pygame.Surface(self._rect.size)
 
         # fill background color for all buttons
         self.surfaceNormal.fill(self.bgcolor)
         self.surfaceDown.fill(self.bgcolor)
-        self.surfaceHighlight.fill(self.bgcolor)
 
         # draw caption text for all buttons
         captionSurf = self._font.render(self._caption, True,\
@@ -235,6 +251,13 @@ class PygButton(object):
         # draw border for highlight button
         self.surfaceHighlight = self.surfaceNormal
 
+        # convert to the screen's format so blitting them is quicker
+        if pygame.display.get_surface() is not None:
+            self.surfaceNormal = self.surfaceNormal.convert()
+            self.surfaceDown = self.surfaceDown.convert()
+            self.surfaceHighlight = self.surfaceNormal
+        return self.surfaceNormal, self.surfaceDown, self.surfaceHighlight
+
 
     def mouseClick(self, event):
         pass # This class is meant to be overridden.
@@ -343,3 +366,9 @@ class PygButton(object):
     bgcolor = (255,206,173)
     #property(_propGetBgColor, _propSetBgColor)
     font = property(_propGetFont, _propSetFont)
+
+
+def drawButtons(surfaceObj, buttons):
+    """Blit the current appearance of all the visible buttons to the surface
+    object with one Surface.blits call. Returns the list of rects drawn to."""
+    return surfaceObj.blits([(b._currentSurface(), b._rect) for b in buttons if b._visible])
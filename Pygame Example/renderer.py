@@ -0,0 +1,90 @@
+import pygame
+import assets
+
+class DirtyRenderer(object):
+    """Keeps track of which parts of the screen changed since the last frame,
+    so pygame.display.update only has to send those parts to the window.
+    When the camera moves every pixel changes, so the whole screen is sent
+    instead, and invalidate does the same after a menu or overlay has been
+    drawn over the game. With enabled set to False the whole screen is
+    always sent, like before"""
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        #start with a full update, nothing has been drawn yet
+        self.full = True
+        self.offset = None
+        self.dirty = []
+        #where each sprite was drawn on the last frame and this frame
+        self.last = {}
+        self.current = {}
+
+    def begin(self, offset):
+        """Starts a new frame. offset is where the camera is, if it is not
+        where it was last frame then the whole screen has changed"""
+        if offset != self.offset:
+            self.offset = offset
+            self.full = True
+
+    def invalidate(self):
+        """Makes the next frame send the whole screen, e.g. after a pause
+        message was drawn over the game"""
+        self.full = True
+
+    def mark(self, rect):
+        """Marks a part of the screen as changed"""
+        self.dirty.append(rect)
+
+    def track(self, sprite, rect, animated=False):
+        """Records where a sprite was drawn this frame. If it has moved,
+        both where it was and where it is now have changed. Animated sprites
+        change their image every frame so they are always marked"""
+        last = self.last.pop(sprite, None)
+        if animated or last != rect:
+            self.dirty.append(rect)
+            if last is not None:
+                self.dirty.append(last)
+        self.current[sprite] = rect
+
+    def present(self):
+        """Sends the changed parts of the screen to the window"""
+        #anything drawn last frame but not this frame has gone, e.g. a coin
+        #that was collected, so the space it was in has changed too
+        self.dirty.extend(self.last.values())
+        if self.full or not self.enabled:
+            pygame.display.update()
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+        self.full = False
+        self.dirty = []
+        self.last = self.current
+        self.current = {}
+
+
+class StaticLayer(object):
+    """Draws every sprite that never moves or disappears (the backgrounds
+    and exit doors) onto one picture of the whole level when the level is
+    built. The picture is cut into square chunks so huge levels don't need
+    one enormous surface. Each frame the part the camera can see is drawn
+    with one blit per chunk on screen instead of a blit per sprite"""
+    def __init__(self, sprites, width, height, chunksize=1024):
+        #list of (rect of the chunk in the level, surface)
+        self.chunks = []
+        for y in range(0, height, chunksize):
+            for x in range(0, width, chunksize):
+                rect = pygame.rect.Rect(x, y, min(chunksize, width - x), \
+                                        min(chunksize, height - y))
+                surface = assets.display_format(pygame.Surface(rect.size))
+                #draw the sprites in the order given so they overlap the
+                #same way they would if drawn separately
+                for sprite in sprites:
+                    surface.blit(sprite.image, (sprite.rect.left - x, \
+                                                sprite.rect.top - y))
+                self.chunks.append((rect, surface))
+
+    def draw(self, screen, view):
+        """Blits the chunks that are inside view, the part of the level the
+        camera can see, onto the screen"""
+        for rect, surface in self.chunks:
+            if rect.colliderect(view):
+                screen.blit(surface, (rect.left - view.left, \
+                                      rect.top - view.top))
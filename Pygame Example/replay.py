@@ -0,0 +1,123 @@
+import sys
+import pygame
+import controls
+import gameclasses
+import scenes
+
+#where game_run saves the last game played, play it back with
+#   python replay.py lastgame.replay
+#or add --watch to see it played back at normal speed
+REPLAY_FILE = "lastgame.replay"
+
+class Recording(object):
+    """The controls held and pressed on every tick the level was played,
+    along with the level, lives and score the game started with. Ticks where
+    the controls didn't change are stored as one run of [ticks, held,
+    pressed], so a minute of play is a few hundred runs at most"""
+    def __init__(self, levelnumber=1, lives=3, levelscore=0):
+        self.levelnumber = levelnumber
+        self.lives = lives
+        self.levelscore = levelscore
+        self.runs = []
+
+    def record(self, held, pressed):
+        """Adds one tick's controls, called by the Playing scene"""
+        if self.runs and self.runs[-1][1] == held \
+           and self.runs[-1][2] == pressed:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, held, pressed])
+
+    def ticks(self):
+        """Yields (held, pressed) for every tick, in order"""
+        for count, held, pressed in self.runs:
+            for i in range(count):
+                yield held, pressed
+
+    def save(self, filename):
+        """Writes the recording as text, the starting level, lives and score
+        on the first line then one run per line"""
+        f = open(filename, "w")
+        f.write("{0} {1} {2}\n".format(self.levelnumber, self.lives, \
+                                        self.levelscore))
+        for run in self.runs:
+            f.write("{0} {1} {2}\n".format(*run))
+        f.close()
+
+def load(filename):
+    """Reads a recording written by Recording.save"""
+    f = open(filename, "r")
+    lines = f.read().split("\n")
+    f.close()
+    levelnumber, lives, levelscore = [int(n) for n in lines[0].split()]
+    recording = Recording(levelnumber, lives, levelscore)
+    for line in lines[1:]:
+        if line.strip():
+            recording.runs.append([int(n) for n in line.split()])
+    return recording
+
+def play(recording, game, after_tick=None):
+    """Plays a recording back on game, running each tick through the Playing
+    scene exactly as when it was recorded, so the player and enemies end up
+    exactly where they were. Where the game left the level, e.g. to the
+    level complete screen, it carries on the way the player must have for
+    there to be more ticks. after_tick(game) is called after every tick.
+    Returns the number of ticks played"""
+    game.levelnumber = recording.levelnumber
+    game.lives = recording.lives
+    game.levelscore = recording.levelscore
+    game.__init__()
+    playing = scenes.Playing(game)
+    #what the game has to do before the next tick, if there is one
+    carry_on = None
+    played = 0
+    for held, pressed in recording.ticks():
+        if carry_on is not None:
+            carry_on()
+            carry_on = None
+        controls.actions.held = held
+        controls.actions.pressed = pressed
+        name = playing.update([])
+        played += 1
+        if after_tick is not None:
+            after_tick(game)
+        if name == scenes.QUIT:
+            break
+        #what the scene the game changed to does to get back to playing
+        if name == 'paused':
+            game.gamepaused = False
+        elif name == 'levelcomplete':
+            game.levelcomplete = False
+            carry_on = game.next_level
+        elif name == 'gameover':
+            game.gameover = False
+            carry_on = game.restart_game
+        elif name == 'gamecomplete':
+            carry_on = game.restart_game
+    return played
+
+def main(args):
+    watch = "--watch" in args
+    args = [arg for arg in args if arg != "--watch"]
+    filename = args[0] if args else REPLAY_FILE
+    pygame.init()
+    import GAMECOURSEWORKFINALVERSION as jungle
+    screen = pygame.display.set_mode(jungle.SIZE, jungle.FLAGS, jungle.DEPTH)
+    pygame.display.set_caption('JUNGLE RUN! replay')
+    recording = load(filename)
+    game = jungle.Game()
+    clock = pygame.time.Clock()
+
+    def draw(game):
+        pygame.event.pump()
+        game.draw(screen)
+        clock.tick(gameclasses.TICK_RATE)
+
+    ticks = play(recording, game, draw if watch else None)
+    player = game.player
+    print("{0} ticks, level {1}, lives {2}, score {3}, player at {4}".format( \
+          ticks, game.levelnumber, game.lives, game.score, player.rect))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,276 @@
+import pygame
+import controls
+import gameclasses
+import scheduler
+import ui
+
+#the name a scene's update returns to stop the game
+QUIT = 'quit'
+
+#most times a second the level is drawn while it is being played, it is
+#simulated at gameclasses.TICK_RATE however often it is drawn
+RENDER_FPS = 60
+
+#longest a frame counts as, in seconds, so after a stall the simulation
+#doesn't try to catch up on all of it at once
+MAX_FRAME = 0.25
+
+class Scene(object):
+    """One screen of the game, e.g. the main menu or the level being played.
+    When the Director changes to a scene it calls enter, then every frame
+    update with that frame's events followed by render. update returns the
+    name of the scene to change to, or None to stay on this one"""
+    #frames per second the Director runs at while this scene is current. 0
+    #means the scene only changes when the player does something, so the
+    #Director sleeps until an event arrives instead
+    fps = 0
+    #if set, update is called this many times a second however many frames
+    #are drawn, and render is told how far between two updates it is
+    tickrate = 0
+
+    def __init__(self, game):
+        self.game = game
+        self.ignoring = False
+
+    def ignore_input(self, seconds):
+        """Throws away events for a while, so a button pressed just before
+        the scene came up doesn't skip straight past it"""
+        self.ignoring = True
+        scheduler.timers.after(seconds, self.stop_ignoring)
+
+    def stop_ignoring(self):
+        self.ignoring = False
+
+    def enter(self, screen):
+        pass
+
+    def update(self, events):
+        return None
+
+    def render(self, screen, alpha):
+        """Draws the scene. alpha is how far the frame is between the last
+        update and the next one, only scenes with a tickrate need it"""
+        pass
+
+
+class Director(object):
+    """Runs the current scene and changes between them. It is the only
+    place events are taken off the queue and the only place that waits
+    between frames, so every scene gets the same frame pacing and each event
+    is only handled once"""
+    def __init__(self, screen, scenes, start):
+        self.screen = screen
+        self.scenes = scenes
+        self.clock = pygame.time.Clock()
+        #seconds that have passed but not been simulated yet, and events
+        #waiting for the next update, for scenes with a tickrate
+        self.lag = 0
+        self.events = []
+        self.scene = None
+        self.change(start)
+
+    def change(self, name):
+        self.scene = self.scenes[name]
+        self.scene.enter(self.screen)
+        #don't count the time spent in the last scene against the first
+        #frame of this one
+        self.clock.tick()
+        self.lag = 0
+        self.events = []
+        #space is select in menus and jump in the game, so nothing held from
+        #the last scene counts in this one
+        controls.actions.release()
+
+    def frame(self):
+        """Runs one frame of the current scene, returns False once the game
+        should quit"""
+        scene = self.scene
+        if scene.tickrate:
+            return self.fixed_frame(scene)
+        if scene.fps:
+            self.clock.tick(scene.fps)
+            events = pygame.event.get()
+        else:
+            #wake up in time for anything the scheduler has due
+            events = ui.wait_events(scheduler.timers.timeout(ui.IDLE_TIMEOUT))
+            self.clock.tick()
+        scheduler.timers.advance(self.clock.get_time() / 1000)
+        name = self.update(scene, events)
+        if name == QUIT:
+            return False
+        #the frame that caused the change is still drawn, so e.g. the pause
+        #message goes over the frame where p was pressed
+        scene.render(self.screen, 1)
+        if name is not None:
+            self.change(name)
+        return True
+
+    def update(self, scene, events):
+        """Gives the events to the controls, then updates the scene. While a
+        scene is ignoring input the controls still see keys being let go, but
+        nothing counts as pressed"""
+        controls.actions.update(events)
+        if scene.ignoring:
+            controls.actions.pressed = 0
+            events = []
+        return scene.update(events)
+
+    def fixed_frame(self, scene):
+        """Runs one frame of a scene with a tickrate. The scene is updated
+        once for every 1/tickrate seconds that have passed, which can be
+        none or several times a frame, so it runs at the same speed whether
+        it is drawn faster or slower than it is simulated"""
+        self.clock.tick(scene.fps)
+        scheduler.timers.advance(self.clock.get_time() / 1000)
+        self.events.extend(pygame.event.get())
+        self.lag += min(self.clock.get_time() / 1000, MAX_FRAME)
+        step = 1 / scene.tickrate
+        name = None
+        while self.lag >= step and name is None:
+            #the events only go to the first update, later ones in the same
+            #frame happened after them
+            name = self.update(scene, self.events)
+            self.events = []
+            self.lag -= step
+        if name == QUIT:
+            return False
+        scene.render(self.screen, min(self.lag / step, 1))
+        if name is not None:
+            self.change(name)
+        return True
+
+    def run(self):
+        while self.frame():
+            pass
+
+
+class Menu(Scene):
+    def enter(self, screen):
+        self.game.menuscreen(screen)
+
+    def update(self, events):
+        return self.game.menu_logic(events)
+
+    def render(self, screen, alpha):
+        #only redraw buttons whose graphics changed, e.g. on mouse over
+        self.game.uiscreen('menu').refresh(screen)
+
+
+class Instructions(Scene):
+    def enter(self, screen):
+        self.game.instruction_screen(screen)
+
+    def update(self, events):
+        return self.game.instruction_logic(events)
+
+    def render(self, screen, alpha):
+        self.game.uiscreen('instructions').refresh(screen)
+
+
+class Playing(Scene):
+    """The level being played, the only scene that runs every frame. If it
+    is given a replay.Recording, the controls of every tick go into it"""
+    fps = RENDER_FPS
+    tickrate = gameclasses.TICK_RATE
+
+    def __init__(self, game, recording=None):
+        super().__init__(game)
+        self.recording = recording
+
+    def enter(self, screen):
+        #whatever screen was up before covered the game, so draw all of it
+        self.game.renderer.invalidate()
+
+    def update(self, events):
+        game = self.game
+        if self.recording is not None:
+            self.recording.record(controls.actions.held, \
+                                  controls.actions.pressed)
+        if not game.game_logic():
+            return QUIT
+        game.simulate()
+        #the game logic sets these when the player pauses, finishes a level
+        #or the game, or runs out of lives
+        if game.gamepaused:
+            return 'paused'
+        if game.levelcomplete:
+            return 'levelcomplete'
+        if game.gameover:
+            return 'gameover'
+        if game.gamecomplete:
+            return 'gamecomplete'
+        return None
+
+    def render(self, screen, alpha):
+        self.game.draw(screen, alpha)
+
+
+class Paused(Scene):
+    def enter(self, screen):
+        self.game.gamepause_screen(screen)
+        self.game.gamepaused = False
+
+    def update(self, events):
+        return self.game.gamepause_logic()
+
+
+class LevelComplete(Scene):
+    def enter(self, screen):
+        self.game.level_complete_screen(screen)
+        self.game.levelcomplete = False
+        self.ignore_input(1)
+
+    def update(self, events):
+        return self.game.level_complete_logic()
+
+
+class GameOver(Scene):
+    def enter(self, screen):
+        self.game.game_over_screen(screen)
+        self.game.gameover = False
+        self.ignore_input(1)
+
+    def update(self, events):
+        return self.game.game_over_logic()
+
+
+class GameComplete(Scene):
+    def enter(self, screen):
+        self.game.gamecomplete_screen(screen)
+
+    def update(self, events):
+        return self.game.gamecomplete_logic()
+
+
+class EnterName(Scene):
+    def enter(self, screen):
+        self.game.entername_screen(screen)
+
+    def update(self, events):
+        return self.game.entername_logic(events)
+
+    def render(self, screen, alpha):
+        #redraw buttons and the initials only when they change
+        self.game.uiscreen('entername').refresh(screen)
+
+
+class HighScores(Scene):
+    def enter(self, screen):
+        self.game.highscore_screen(screen)
+
+    def update(self, events):
+        return self.game.highscore_logic()
+
+
+def game_scenes(game, recording=None):
+    """Returns every scene of the game by name. recording is passed to the
+    Playing scene"""
+    return {'menu': Menu(game),
+            'instructions': Instructions(game),
+            'playing': Playing(game, recording),
+            'paused': Paused(game),
+            'levelcomplete': LevelComplete(game),
+            'gameover': GameOver(game),
+            'gamecomplete': GameComplete(game),
+            'entername': EnterName(game),
+            'highscores': HighScores(game)}
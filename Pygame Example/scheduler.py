@@ -0,0 +1,45 @@
+import heapq
+
+class Scheduler(object):
+    """A heap of callbacks waiting to be run at a set time. The Director
+    moves the scheduler's time on every frame and runs whatever is due, so
+    a delay happens while the game keeps handling events and drawing rather
+    than the whole program stopping in time.sleep"""
+    def __init__(self):
+        #how far the scheduler has been moved on, in seconds or, for a
+        #scheduler moved on a tick at a time, ticks
+        self.now = 0
+        #[time due, order added, callback, args], soonest first. The order
+        #added keeps callbacks due at the same time in the order they were
+        #added and means two entries never have to compare their callbacks
+        self.queue = []
+        self.added = 0
+
+    def after(self, seconds, callback, *args):
+        """Runs callback(*args) once seconds (or ticks) have passed"""
+        self.added += 1
+        heapq.heappush(self.queue, [self.now + seconds, self.added, \
+                                    callback, args])
+
+    def advance(self, seconds):
+        """Moves time on and runs every callback that is now due"""
+        self.now += seconds
+        while self.queue and self.queue[0][0] <= self.now:
+            due, added, callback, args = heapq.heappop(self.queue)
+            callback(*args)
+
+    def clear(self):
+        """Drops every callback still waiting to run"""
+        self.queue = []
+
+    def timeout(self, longest):
+        """Returns how many milliseconds until the next callback is due, but
+        no more than longest, for screens that sleep until an event. It is
+        never less than 1, pygame.event.wait(0) waits for an event however
+        long it takes, so a callback already due would wait for one too"""
+        if not self.queue:
+            return longest
+        return max(1, min(longest, int((self.queue[0][0] - self.now) * 1000)))
+
+#the scheduler the game's delays go through
+timers = Scheduler()
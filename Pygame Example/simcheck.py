@@ -0,0 +1,99 @@
+import sys
+import numpy
+import batchsim
+import controls
+import gameclasses
+import levels
+import world
+
+def check_fast_forward(ticks=600):
+    """Moves pairs of enemies on patrols of every width from too narrow to
+    walk up to a few hundred pixels, one with update, check_state and
+    animate each tick and the other with fast_forward in jumps of different
+    lengths, and compares them after every jump. Enemies start at the left
+    end, the middle or the right end of their patrol, the level builder
+    never puts one outside it. Returns how many pairs ended up different,
+    with the first difference of each printed"""
+    different = 0
+    for width in range(27, 300, 7):
+        room = width - 27
+        for left, jump in [(left, jump) for left in (0, room // 2, room) \
+                           for jump in (1, 2, 3, 7, 50, 301)]:
+            patrol = (100 - left, 100 - left + width)
+            stepped = gameclasses.Enemyblock(100, 100, patrol)
+            forward = gameclasses.Enemyblock(100, 100, patrol)
+            done = 0
+            while done < ticks:
+                for tick in range(jump):
+                    stepped.update()
+                    stepped.check_state()
+                    stepped.animate()
+                forward.fast_forward(jump)
+                done += jump
+                want = (tuple(stepped.rect), stepped.vx, stepped.state, \
+                        stepped.frame, stepped.counter, stepped.image)
+                got = (tuple(forward.rect), forward.vx, forward.state, \
+                       forward.frame, forward.counter, forward.image)
+                if got != want:
+                    print("patrol {0}, jumps of {1}, after {2} ticks: " \
+                          "{3} not {4}".format(patrol, jump, done, \
+                                               got[:5], want[:5]))
+                    different += 1
+                    break
+    return different
+
+def check_batch(levelnumber, n=20, steps=400, seed=0):
+    """Plays n players holding random controls through a Batch and, one
+    at a time, through the game's own World with its enemies taken out, and
+    compares them every step. Returns how many players ended up somewhere
+    different, with the first step each one did printed"""
+    moves = numpy.array([0, controls.LEFT, controls.RIGHT, controls.JUMP, \
+                         controls.LEFT | controls.JUMP, \
+                         controls.RIGHT | controls.JUMP, \
+                         controls.LEFT | controls.RIGHT])
+    random = numpy.random.RandomState(seed)
+    actions = moves[random.randint(len(moves), size=(steps, n))]
+    #players hold each control for a while, like a person would
+    held = random.random_sample((steps, n)) < 0.8
+    for step in range(1, steps):
+        actions[step] = numpy.where(held[step], actions[step - 1], \
+                                    actions[step])
+    batch = batchsim.Batch(levels.LEVELS[levelnumber], n, \
+                           levels.STARTS[levelnumber])
+    got = []
+    for step in range(steps):
+        batch.step(actions[step])
+        got.append(list(zip(batch.x.tolist(), batch.y.tolist(), \
+                            batch.vy.tolist(), batch.onground.tolist(), \
+                            (~batch.alive).tolist(), batch.complete.tolist())))
+    w = world.World()
+    different = 0
+    for i in range(n):
+        w.reset(levelnumber, enemies=False)
+        for step in range(steps):
+            w.step(int(actions[step, i]))
+            p = w.player
+            want = (p.rect.x, p.rect.y, float(p.vy), p.onGround, \
+                    p.falldeath, p.levelcomplete)
+            if got[step][i] != want:
+                print("level {0} player {1} step {2}: batch {3}, world " \
+                      "{4}".format(levelnumber, i, step, got[step][i], want))
+                different += 1
+                break
+            if p.falldeath or p.levelcomplete:
+                break
+    return different
+
+def main(args):
+    """Checks the shortcuts the simulation takes against doing it the slow
+    way, e.g.
+        python simcheck.py
+    and exits with 1 if any of them come out different"""
+    enemies = check_fast_forward()
+    print("fast_forward: {0} enemies different".format(enemies))
+    players = sum(check_batch(number) for number in sorted(levels.LEVELS))
+    print("batchsim: {0} players different".format(players))
+    return 1 if enemies or players else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,46 @@
+class SpatialGrid(object):
+    """Splits the level into square cells and remembers which sprites touch
+    each cell, so a collision check only has to look at the sprites in the
+    cells around a rectangle instead of every sprite in the level"""
+    def __init__(self, cellsize=32):
+        self.cellsize = cellsize
+        #cells maps a (column, row) pair to a list of item numbers, the item
+        #numbers index into self.items which keeps the order things were
+        #added in so queries return sprites in the same order as the level
+        self.cells = {}
+        self.items = []
+
+    def cell_range(self, rect):
+        """Returns the range of columns and rows a rectangle overlaps"""
+        size = self.cellsize
+        #right and bottom are one pixel past the rect, so take one off to
+        #stop a rect sitting exactly on a cell edge spilling into the next
+        return (range(rect.left // size, (rect.right - 1) // size + 1),
+                range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def add(self, sprite, rect=None):
+        """Adds a sprite to every cell its rect covers. A different rect can
+        be given for sprites whose image is bigger than their rect"""
+        if rect is None:
+            rect = sprite.rect
+        number = len(self.items)
+        self.items.append(sprite)
+        columns, rows = self.cell_range(rect)
+        for col in columns:
+            for row in rows:
+                self.cells.setdefault((col, row), []).append(number)
+
+    def query(self, rect):
+        """Returns the sprites in the cells the rect overlaps, in the order
+        they were added to the grid. These are only possible collisions, the
+        caller still has to do the exact rect check"""
+        cells = self.cells
+        columns, rows = self.cell_range(rect)
+        found = set()
+        for col in columns:
+            for row in rows:
+                cell = cells.get((col, row))
+                if cell:
+                    found.update(cell)
+        items = self.items
+        return [items[number] for number in sorted(found)]
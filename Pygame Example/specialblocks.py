@@ -1,14 +1,13 @@
 import pygame
 from easypg import colours
+import assets
 
 class Fallblock(pygame.sprite.Sprite):
-    """Detect whether a player has fallen off screen"""
-    def __init__(self, x, y):
+    """Detect whether a player has fallen off screen. Like platforms, one
+    fallblock can cover a whole run of tiles and is never drawn"""
+    def __init__(self, x, y, width=32, height=32):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((32, 32))
-        self.image.convert()
-        self.image.fill(colours.AQUA)
-        self.rect = pygame.rect.Rect(x, y, 32, 32)
+        self.rect = pygame.rect.Rect(x, y, width, height)
         
     def update(self):
         pass
@@ -17,8 +16,7 @@ class Jumppad(pygame.sprite.Sprite):
     """Jumppad blocks shoot player up in the air when stood on top of"""
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((32, 32))
-        self.image.convert()
+        self.image = assets.display_format(pygame.Surface((32, 32)))
         self.image.fill(colours.MAROON)
         self.rect = pygame.rect.Rect(x, y, 32, 32)
         
@@ -27,11 +25,9 @@ class Jumppad(pygame.sprite.Sprite):
 
 class Collectible(pygame.sprite.Sprite):
     """Collectibles increase in game score when collected"""
-    image = pygame.image.load("coin.png") 
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = Collectible.image
-        self.image.convert()
+        self.image = assets.images.load("coin.png", alpha=True)
         self.rect = pygame.rect.Rect(x, y, 24, 24)
 
 
@@ -40,11 +36,9 @@ class Collectible(pygame.sprite.Sprite):
     
 class Heart(pygame.sprite.Sprite):
     """Collectibles increase in game score when collected"""
-    image = pygame.image.load("heart.png") 
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = Heart.image
-        self.image.convert()
+        self.image = assets.images.load("heart.png", alpha=True)
         self.rect = pygame.rect.Rect(x, y, 24, 24)
         
     def update(self):
@@ -54,8 +48,7 @@ class Exit_door(pygame.sprite.Sprite):
     """Door which player can step in to complete the level"""
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((32, 64))
-        self.image.convert()
+        self.image = assets.display_format(pygame.Surface((32, 64)))
         self.image.fill(colours.BLACK)
         self.rect = pygame.rect.Rect(x, y, 32, 64)
 
@@ -66,8 +59,7 @@ class Spike(pygame.sprite.Sprite):
     """Detect whether a player has fallen off screen"""
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((32, 32))
-        self.image.convert()
+        self.image = assets.display_format(pygame.Surface((32, 32)))
         self.image.fill(colours.GREY)
         self.rect = pygame.rect.Rect(x, y, 32, 32)
         
@@ -0,0 +1,52 @@
+class TriggerLayer(object):
+    """Keeps every block the player can touch but not stand on - fallblocks,
+    coins, hearts, exit doors and jumppads - in one list of rects, so a
+    single Rect.collidelistall call finds everything the player is touching
+    instead of looping over each kind of block separately"""
+    #the kinds of trigger, used as the keys of the dictionary touching returns
+    FALL = 'fall'
+    COIN = 'coin'
+    HEART = 'heart'
+    EXIT = 'exit'
+    JUMPPAD = 'jumppad'
+
+    def __init__(self):
+        #the three lists line up, so rects[i] is the rect of sprites[i] and
+        #kinds[i] says what sort of trigger it is
+        self.rects = []
+        self.kinds = []
+        self.sprites = []
+
+    def add(self, kind, sprite):
+        """Adds a sprite to the layer as the given kind of trigger"""
+        self.rects.append(sprite.rect)
+        self.kinds.append(kind)
+        self.sprites.append(sprite)
+
+    def touching(self, rect):
+        """Returns a dictionary of kind to the list of sprites of that kind
+        the rect overlaps, in the order they were added"""
+        kinds = self.kinds
+        sprites = self.sprites
+        found = {}
+        for i in rect.collidelistall(self.rects):
+            found.setdefault(kinds[i], []).append(sprites[i])
+        return found
+
+    def remove(self, sprite):
+        """Takes a sprite out of the layer, e.g. a coin once it is collected.
+        Safe to call while going through the result of touching, since that
+        is a separate list"""
+        i = self.sprites.index(sprite)
+        del self.rects[i]
+        del self.kinds[i]
+        del self.sprites[i]
+
+    def copy(self):
+        """Returns a new layer holding the same triggers, so a restart can
+        remove coins from its copy without touching the original"""
+        layer = TriggerLayer()
+        layer.rects = list(self.rects)
+        layer.kinds = list(self.kinds)
+        layer.sprites = list(self.sprites)
+        return layer
@@ -0,0 +1,123 @@
+import pygame
+import pygbutton
+
+#how long a menu waiting for input sleeps before waking up anyway, in
+#milliseconds
+IDLE_TIMEOUT = 500
+
+def wait_events(timeout=IDLE_TIMEOUT):
+    """Used instead of pygame.event.get on screens that are just waiting for
+    the player. Sleeps until an event arrives or timeout milliseconds pass,
+    then returns every waiting event, or an empty list if it timed out, so
+    an idle menu doesn't keep a CPU core busy"""
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+class Label(object):
+    """Text on a UIScreen that can change while the screen is up, drawn with
+    its top centre at position. When the text changes, the area in clear is
+    covered with the screen's background before the new text is drawn"""
+    def __init__(self, font, colour, position, clear):
+        self.font = font
+        self.colour = colour
+        self.position = position
+        self.clear = pygame.Rect(clear)
+        self.text = ""
+        self.drawn = None
+
+    def set(self, text):
+        self.text = text
+
+    def changed(self):
+        return self.drawn != self.text
+
+    def draw(self, screen, background):
+        screen.blit(background, self.clear, self.clear)
+        surface = self.font.render(self.text, True, self.colour)
+        x, y = self.position
+        screen.blit(surface, [x - surface.get_width()//2, y])
+        self.drawn = self.text
+        return self.clear
+
+
+class UIScreen(object):
+    """A menu screen that is built once and kept. The background, boxes and
+    text that never change are drawn onto one surface when it is built, so
+    showing the screen again is a single blit. After that only the buttons
+    whose hover or pressed state has changed, and labels whose text has
+    changed, are drawn again and sent to the window"""
+    def __init__(self, background):
+        self.background = background.copy()
+        #(name, PygButton) in the order they were added
+        self.buttons = []
+        #the look each button was last drawn with
+        self.looks = {}
+        self.labels = {}
+
+    def add_text(self, surface, position):
+        """Adds text that never changes to the screen's background"""
+        self.background.blit(surface, position)
+
+    def add_rect(self, colour, rect, width=0):
+        """Adds a box that never changes to the screen's background"""
+        pygame.draw.rect(self.background, colour, rect, width)
+
+    def add_button(self, name, button):
+        """Adds a pygbutton.PygButton, handle returns name when it is
+        clicked"""
+        self.buttons.append((name, button))
+
+    def add_label(self, name, label):
+        self.labels[name] = label
+
+    def look(self, button):
+        return (button.visible, button.buttonDown, button.mouseOverButton)
+
+    def show(self, screen):
+        """Draws the whole screen and updates the whole window"""
+        screen.blit(self.background, (0, 0))
+        buttons = [button for name, button in self.buttons]
+        pygbutton.drawButtons(screen, buttons)
+        for button in buttons:
+            self.looks[button] = self.look(button)
+        for label in self.labels.values():
+            label.draw(screen, self.background)
+        pygame.display.update()
+
+    def handle(self, event):
+        """Passes an event to every button, returns the names of the buttons
+        it clicked"""
+        clicked = []
+        for name, button in self.buttons:
+            if 'click' in button.handleEvent(event):
+                clicked.append(name)
+        return clicked
+
+    def handle_all(self, events):
+        """Passes a list of events to every button, returns the names of the
+        buttons they clicked"""
+        clicked = []
+        for event in events:
+            clicked.extend(self.handle(event))
+        return clicked
+
+    def refresh(self, screen):
+        """Draws any buttons or labels that look different to when they were
+        last drawn and sends just those parts of the screen to the window.
+        Returns True if anything was drawn"""
+        changed = []
+        for name, button in self.buttons:
+            look = self.look(button)
+            if self.looks.get(button) != look:
+                changed.append(button)
+                self.looks[button] = look
+        pygbutton.drawButtons(screen, changed)
+        rects = [button.rect for button in changed]
+        for label in self.labels.values():
+            if label.changed():
+                rects.append(label.draw(screen, self.background))
+        if rects:
+            pygame.display.update(rects)
+        return bool(rects)
@@ -0,0 +1,163 @@
+import pygame
+import controls
+import gameclasses
+import levelbuilder
+import levels
+import spatialgrid
+
+#enemies whose patrol is further than this outside the camera are asleep. It
+#is more than the player can move in a step, so the player never touches a
+#sleeping enemy
+ACTIVE_MARGIN = 256
+#the cell size of the grid the enemies near the camera are looked up in
+ENEMY_CELL = 256
+
+class World(object):
+    """The part of the game that moves: one level's player, enemies, coins,
+    hearts and so on, stepped one tick at a time. It needs no window, sound
+    or controller, so levels can be played headless, e.g. by automated
+    playtests. Game draws the world and plays sounds for the events it gives
+    back, but everything the player and enemies do happens in here.
+
+    Only the enemies near the camera are updated. The rest are asleep and
+    cost nothing each step, and when the camera comes near one it is fast
+    forwarded to where it would have been, so the world plays out exactly
+    the same as if every enemy was updated every step"""
+    #levels that have already been built, by level number. Kept on the class
+    #so dying or restarting doesn't build the whole level again
+    compiledlevels = {}
+
+    def __init__(self):
+        #coins, hearts, enemies and the player, in the order they are drawn.
+        #Collected coins and killed enemies are taken out of it
+        self.sprites = pygame.sprite.OrderedUpdates()
+        self.levelnumber = None
+
+    def reset(self, levelnumber, enemies=True):
+        """Starts the level from the beginning, with every coin, heart and
+        enemy back where they started. With enemies False the level has
+        none, e.g. to compare with batchsim, which leaves them out. Returns
+        the first observation"""
+        self.levelnumber = levelnumber
+        #the level's sprites are reused between restarts, so empty the group
+        #first or every sprite would keep the old group alive as well
+        self.sprites.empty()
+        #build the level the first time it is played, after that the built
+        #level is reused and only the coins, hearts and enemies are reset
+        if levelnumber not in self.compiledlevels:
+            self.compiledlevels[levelnumber] = \
+                levelbuilder.CompiledLevel(levels.LEVELS[levelnumber])
+        self.level = self.compiledlevels[levelnumber]
+        #coins and hearts get removed from the trigger layer when collected,
+        #so each restart gets a copy holding all of them again
+        self.triggers = self.level.triggers.copy()
+        self.enemies = self.level.spawn_enemies() if enemies else []
+        self.sprites.add(self.level.sprites)
+        #enemies go after the coins and hearts so they are drawn on top
+        for e in self.enemies:
+            self.sprites.add(e)
+        x, y = levels.STARTS[levelnumber]
+        self.player = gameclasses.PLAYER(x, y)
+        self.sprites.add(self.player)
+        self.ticks = 0
+        #enemies never leave their patrol, so the grid of where they patrol
+        #finds every enemy near the camera without looking at the others
+        self.enemygrid = spatialgrid.SpatialGrid(ENEMY_CELL)
+        for e in self.enemies:
+            self.enemygrid.add(e, e.patrol_rect())
+        self.camera = gameclasses.Camera(gameclasses.camera_rect, \
+                                         self.level.width, self.level.height)
+        #the enemies being updated, in level order, and the tick each
+        #sleeping enemy was last updated to. Every enemy starts asleep at
+        #tick 0 and the first step wakes the ones near the player. Killed
+        #enemies stay in the grid, so they are remembered to skip them
+        self.awake = []
+        self.sleeping = dict.fromkeys(self.enemies, 0)
+        self.killed = set()
+        return self.observe()
+
+    def wake(self):
+        """Wakes the enemies whose patrol is near the camera, fast forwarding
+        them to now, and puts the rest of the ones that were awake to
+        sleep"""
+        self.camera.update(self.player)
+        view = self.camera.view().inflate(2 * ACTIVE_MARGIN, 2 * ACTIVE_MARGIN)
+        awake = [e for e in self.enemygrid.query(view) \
+                 if e not in self.killed and view.colliderect(e.patrol_rect())]
+        for e in awake:
+            if e in self.sleeping:
+                e.fast_forward(self.ticks - self.sleeping.pop(e))
+        stillawake = set(awake)
+        for e in self.awake:
+            if e not in stillawake:
+                self.sleeping[e] = self.ticks
+        self.awake = awake
+
+    def step(self, actions):
+        """Moves the world on one tick. actions is the controls bits held
+        down, of which LEFT, RIGHT and JUMP move the player. Returns
+        (observation, events), events being a list of what happened this
+        tick in the order it happened: 'fall', 'coin', 'heart', 'jumppad',
+        'enemykilled', 'killed' when an enemy kills the player and 'exit'
+        when the player reaches the door"""
+        self.wake()
+        player = self.player
+        killed = player.playerdeath
+        complete = player.levelcomplete
+        awake = list(self.awake)
+        #update player with the controls and everything it can touch, the
+        #sleeping enemies are all too far away to touch
+        player.update(actions & controls.JUMP != 0, False, \
+                      actions & controls.LEFT != 0, \
+                      actions & controls.RIGHT != 0, \
+                      self.level.platformgrid, self.triggers, self.awake, \
+                      self.sprites)
+        #enemies the player killed come out of the awake list, take them
+        #out of the level's as well
+        if len(self.awake) < len(awake):
+            for e in set(awake).difference(self.awake):
+                self.enemies.remove(e)
+                self.killed.add(e)
+        #check state and animate player, the frame shown decides the mask
+        #used for enemy collisions so this is part of the simulation too
+        player.check_state()
+        player.animate()
+        #update the movement of the enemies that are awake
+        for e in self.awake:
+            e.update()
+            e.check_state()
+            e.animate()
+        events = player.events
+        player.events = []
+        if player.playerdeath and not killed:
+            events.append('killed')
+        if player.levelcomplete and not complete:
+            events.append('exit')
+        self.ticks += 1
+        return self.observe(), events
+
+    def enemy_rect(self, e):
+        """Returns where an enemy is now, working it out for a sleeping enemy
+        without waking it"""
+        if e not in self.sleeping:
+            return tuple(e.rect)
+        left = e.patrol(self.ticks - self.sleeping[e])[0]
+        return (left, e.rect.top, e.rect.width, e.rect.height)
+
+    def observe(self):
+        """Returns the state of the world as a dictionary of plain values:
+        the player's rect, velocity and whether it is on the ground, dead or
+        through the door, the coins collected, enemies killed and extra
+        lives picked up, and the rects of the enemies awake near the camera.
+        enemy_rect finds where any other enemy is"""
+        player = self.player
+        return {'tick': self.ticks,
+                'player': tuple(player.rect),
+                'velocity': (player.vx, player.vy),
+                'onground': player.onGround,
+                'dead': player.falldeath or player.playerdeath,
+                'complete': player.levelcomplete,
+                'collected': player.collected,
+                'enemieskilled': player.enemieskilled,
+                'extralives': player.extralives,
+                'enemies': [tuple(e.rect) for e in self.awake]}